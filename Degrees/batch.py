@@ -0,0 +1,121 @@
+import sys
+import time
+from collections import OrderedDict
+
+import degrees
+
+CACHE_SIZE = 64
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(flag.split("=", 1) if "=" in flag else (flag, None)
+                 for flag in sys.argv[1:] if flag.startswith("--"))
+    if len(args) not in [1, 2] or set(flags) - {"--snapshot", "--cache"}:
+        sys.exit("Usage: python batch.py [--snapshot] [--cache=N] directory [pairs.csv]")
+    cache_size = int(flags.get("--cache") or CACHE_SIZE)
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args[0], compact=True, snapshot="--snapshot" in flags)
+    print("Data loaded.", file=sys.stderr)
+
+    if len(args) == 1 or args[1] == "-":
+        lines = sys.stdin
+    else:
+        lines = open(args[1], encoding="utf-8")
+
+    with lines:
+        for line in answer_pairs(read_pairs(lines), TreeCache(degrees.graph, cache_size)):
+            print(line, flush=True)
+
+
+def read_pairs(lines):
+    """
+    Yield (source, target) pairs from lines of the form `source,target`,
+    where each side is a person_id or an unambiguous name.
+    Lines without a comma give (None, None), like names that are not found.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if "," not in line:
+            yield None, None
+            continue
+        source, target = (part.strip() for part in line.split(",", 1))
+        yield resolve(source), resolve(target)
+
+
+def resolve(person):
+    """
+    Return `person` if it is a person_id, otherwise the id of the only
+    person with that name, or None.
+    """
+    if person in degrees.people:
+        return person
+    person_ids = degrees.names.get(person.lower(), set())
+    return next(iter(person_ids)) if len(person_ids) == 1 else None
+
+
+def answer_pairs(pairs, cache):
+    """
+    Answer each of `pairs` as soon as it is read, reusing cached
+    BFS trees for repeated sources.
+    Yield one tab-separated output line per pair, in input order.
+
+    A source needs one BFS as long as its tree stays in `cache`, so input
+    that interleaves more distinct sources than the cache holds repeats
+    searches. Sort the input by source, or raise the cache size, to avoid it.
+    """
+    for source, target in pairs:
+        start = time.perf_counter()
+        if source is None or target is None:
+            path = None
+        else:
+            path = cache.path(source, target)
+        latency = (time.perf_counter() - start) * 1000
+        yield format_answer(source, target, path, latency)
+
+
+def format_answer(source, target, path, latency):
+    """
+    Return `source, target, degrees, path, latency_ms` as a tab-separated line.
+    Degrees is -1 when the pair is not connected or a name was not found.
+    """
+    if path is None:
+        return f"{source}\t{target}\t-1\t\t{latency:.3f}"
+    steps = ";".join(f"{movie_id}:{person_id}" for movie_id, person_id in path)
+    return f"{source}\t{target}\t{len(path)}\t{steps}\t{latency:.3f}"
+
+
+class TreeCache():
+    """
+    Bounded LRU cache of BFS parent trees, keyed by source person_id.
+    Each tree takes two 4-byte entries per person in the graph.
+    """
+    def __init__(self, graph, size=CACHE_SIZE):
+        self.graph = graph
+        self.size = size
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def tree(self, source):
+        if source in self.trees:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            return self.trees[source]
+
+        self.misses += 1
+        tree = self.graph.bfs_tree(source)
+        self.trees[source] = tree
+        if len(self.trees) > self.size:
+            self.trees.popitem(last=False)
+        return tree
+
+    def path(self, source, target):
+        return self.graph.tree_path(self.tree(source), target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import multiprocessing
+import random
+import resource
+import sys
+import time
+
+QUERIES = 200
+
+# (name, load_data keyword arguments, shortest_path keyword arguments)
+BACKENDS = [
+    ("dict", {}, {}),
+    ("dict-bidirectional", {}, {"bidirectional": True}),
+    ("compact", {"compact": True}, {}),
+    ("compact-bidirectional", {"compact": True}, {"bidirectional": True}),
+    ("snapshot", {"snapshot": True}, {}),
+    ("snapshot-bidirectional", {"snapshot": True}, {"bidirectional": True}),
+]
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python benchmark.py directory [queries]")
+    directory = sys.argv[1]
+    queries = int(sys.argv[2]) if len(sys.argv) == 3 else QUERIES
+
+    # Compiles the snapshot up front so the snapshot rows time opening only
+    import snapshot
+    if snapshot.Snapshot.open(directory) is None:
+        snapshot.compile_snapshot(directory)
+
+    print(f"{'backend':<24}{'load':>9}{'rss':>10}{'neighbors':>11}"
+          f"{'p50':>10}{'p90':>10}{'p99':>10}{'expanded':>10}")
+    for backend in BACKENDS:
+        name, load_time, rss, neighbors, latencies, expanded = run_isolated(
+            directory, queries, backend
+        )
+        p50, p90, p99 = (percentile(latencies, p) for p in (50, 90, 99))
+        print(f"{name:<24}{load_time:>8.2f}s{rss / 1024:>8.0f}MB{neighbors:>9.1f}us"
+              f"{p50:>8.2f}ms{p90:>8.2f}ms{p99:>8.2f}ms{expanded:>10.0f}")
+
+
+def run_isolated(directory, queries, backend):
+    """
+    Run `benchmark` for one backend in a fresh interpreter,
+    so that load time and peak RSS are not shared between backends.
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(benchmark, (directory, queries, backend))
+
+
+def benchmark(directory, queries, backend):
+    """
+    Load `directory` with one backend and time random queries against it.
+    Return the backend name, load time in seconds, peak RSS in KB,
+    mean neighbors_for_person time in microseconds, search latencies in
+    milliseconds and mean people expanded per search.
+    """
+    import degrees
+    name, load_options, search_options = backend
+
+    start = time.perf_counter()
+    degrees.load_data(directory, **load_options)
+    load_time = time.perf_counter() - start
+
+    # Draws the same queries for every backend
+    rng = random.Random(0)
+    person_ids = sorted(degrees.people)
+    pairs = [(rng.choice(person_ids), rng.choice(person_ids)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    for source, _ in pairs:
+        for _ in degrees.neighbors_for_person(source):
+            pass
+    neighbors = (time.perf_counter() - start) / queries * 1e6
+
+    latencies = []
+    expanded = 0
+    for source, target in pairs:
+        start = time.perf_counter()
+        degrees.shortest_path(source, target, **search_options)
+        latencies.append((time.perf_counter() - start) * 1000)
+        expanded += degrees.search_stats["expanded"]
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return name, load_time, rss, neighbors, latencies, expanded / queries
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import sys
+import time
+
+from util import (Node, StackFrontier, QueueFrontier, IndexedStackFrontier,
+                  IndexedQueueFrontier, PriorityFrontier)
+
+SIZES = [10 ** 5, 10 ** 6]
+OPERATIONS = 100
+
+FRONTIERS = [
+    ("StackFrontier", StackFrontier),
+    ("IndexedStackFrontier", IndexedStackFrontier),
+    ("QueueFrontier", QueueFrontier),
+    ("IndexedQueueFrontier", IndexedQueueFrontier),
+    ("PriorityFrontier", PriorityFrontier),
+]
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark_frontier.py [operations]")
+    operations = int(sys.argv[1]) if len(sys.argv) == 2 else OPERATIONS
+
+    print(f"{'frontier':<22}{'nodes':>10}{'add':>12}{'contains':>12}{'remove':>12}")
+    for size in SIZES:
+        for name, frontier_class in FRONTIERS:
+            add, contains, remove = benchmark(frontier_class, size, operations)
+            print(f"{name:<22}{size:>10}{add:>10.2f}us{contains:>10.2f}us{remove:>10.2f}us")
+
+
+def benchmark(frontier_class, size, operations):
+    """
+    Fill a frontier of `frontier_class` with `size` nodes, then time
+    `operations` missing-state lookups and removals.
+    Return the mean add, contains_state and remove cost in microseconds.
+    """
+    frontier = frontier_class()
+
+    start = time.perf_counter()
+    for state in range(size):
+        frontier.add(Node(state=state, parent=None, action=None))
+    add = (time.perf_counter() - start) / size
+
+    start = time.perf_counter()
+    for state in range(operations):
+        frontier.contains_state(-state - 1)
+    contains = (time.perf_counter() - start) / operations
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        frontier.remove()
+    remove = (time.perf_counter() - start) / operations
+
+    return add * 1e6, contains * 1e6, remove * 1e6
+
+
+if __name__ == "__main__":
+    main()
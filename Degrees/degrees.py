@@ -1,7 +1,10 @@
 import csv
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from graph import CoStarGraph
+from nameindex import NameIndex
+from snapshot import load_snapshot
+from util import Node, IndexedQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +15,39 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Compact co-star graph, used instead of the sets above when loaded with compact=True
+graph = None
 
-def load_data(directory):
+# Prefix and misspelling lookup over the keys of names
+name_index = None
+
+# Counts the nodes expanded by the most recent search
+search_stats = {"expanded": 0}
+
+
+def load_data(directory, compact=False, snapshot=False):
     """
     Load data from CSV files into memory.
+
+    If `compact` is True, the co-star graph is stored in a CoStarGraph
+    and `people` and `movies` only hold names, births, titles and years.
+    If `snapshot` is True, the same data is memory-mapped from a binary
+    snapshot of the CSV files, which is compiled first if out of date,
+    along with the name index for suggestions.
+    Otherwise the name index is built by the first lookup that needs it.
     """
+    global names, people, movies, graph, name_index
+    if snapshot:
+        names, people, movies, graph, name_index = load_snapshot(directory)
+        return
+
+    name_index = None
+    if compact:
+        graph = CoStarGraph.from_csv(directory, people, movies)
+        for person_id, person in people.items():
+            names.setdefault(person["name"].lower(), set()).add(person_id)
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -53,13 +84,17 @@ def load_data(directory):
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = set(sys.argv[1:]) - set(args)
+    if len(args) > 1 or flags - {"--bidirectional", "--compact", "--snapshot", "--count"}:
+        sys.exit("Usage: python degrees.py [--bidirectional] [--compact] [--snapshot] "
+                 "[--count] [directory]")
+    directory = args[0] if len(args) == 1 else "large"
+    bidirectional = "--bidirectional" in flags
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(directory, compact="--compact" in flags, snapshot="--snapshot" in flags)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +104,8 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, bidirectional=bidirectional)
+    print(f"{search_stats['expanded']} people expanded.")
 
     if path is None:
         print("Not connected.")
@@ -82,17 +118,33 @@ def main():
             person2 = people[path[i + 1][1]]["name"]
             movie = movies[path[i + 1][0]]["title"]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+        if "--count" in flags:
+            print(f"{count_shortest_paths(source, target)} shortest paths in total.")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+    If `bidirectional` is True, searches from both ends at once.
     """
+    if graph is not None:
+        if bidirectional:
+            path = graph.bidirectional_shortest_path(source, target)
+        else:
+            path = graph.shortest_path(source, target)
+        search_stats["expanded"] = graph.expanded
+        return path
+
+    if bidirectional:
+        return bidirectional_shortest_path(source, target)
+
+    search_stats["expanded"] = 0
+
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = IndexedQueueFrontier()
     frontier.add(start)
 
     explored = set()
@@ -113,6 +165,7 @@ def shortest_path(source, target):
             return solution
         
         explored.add(node.state)
+        search_stats["expanded"] += 1
 
         for action, state in neighbors_for_person(node.state):
             if not frontier.contains_state(state) and state not in explored:
@@ -120,13 +173,182 @@ def shortest_path(source, target):
                 frontier.add(child)
 
 
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, growing one BFS
+    frontier from each end and always expanding the smaller one.
+
+    If no possible path, returns None.
+    """
+    search_stats["expanded"] = 0
+
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) they were reached from
+    forward = {source: None}
+    backward = {target: None}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    while forward_layer and backward_layer:
+        # expands a whole layer of the smaller side so the join is shortest
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting = expand_layer(forward_layer, forward, backward)
+        else:
+            backward_layer, meeting = expand_layer(backward_layer, backward, forward)
+
+        if meeting is not None:
+            return join_paths(meeting, forward, backward)
+
+    return None
+
+
+def expand_layer(layer, parents, opposite):
+    """
+    Expands every person in `layer`, recording parents for newly reached people.
+    Returns the next layer and a person reached by both searches, if any.
+    """
+    next_layer = []
+    for person_id in layer:
+        search_stats["expanded"] += 1
+        for movie_id, neighbor in neighbors_for_person(person_id):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = (movie_id, person_id)
+            if neighbor in opposite:
+                return next_layer, neighbor
+            next_layer.append(neighbor)
+    return next_layer, None
+
+
+def join_paths(meeting, forward, backward):
+    """
+    Joins the forward and backward parent maps at `meeting`
+    into a list of (movie_id, person_id) pairs from source to target.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child = backward[person_id]
+        path.append((movie_id, child))
+        person_id = child
+
+    return path
+
+
+def shortest_path_predecessors(source, target):
+    """
+    Runs a layered BFS from the source that stops after the target's layer,
+    recording every (movie_id, person_id) pair that reaches each person
+    from the previous layer.
+
+    Returns the predecessor lists and the people in BFS order,
+    or None if no possible path.
+    """
+    search_stats["expanded"] = 0
+    predecessors = {source: []}
+    depth = {source: 0}
+    order = [source]
+    layer = [source]
+
+    while layer and target not in depth:
+        next_layer = []
+        for person_id in layer:
+            search_stats["expanded"] += 1
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor not in depth:
+                    depth[neighbor] = depth[person_id] + 1
+                    predecessors[neighbor] = []
+                    next_layer.append(neighbor)
+                # only edges from the previous layer lie on shortest paths
+                if depth[neighbor] == depth[person_id] + 1:
+                    predecessors[neighbor].append((movie_id, person_id))
+        order.extend(next_layer)
+        layer = next_layer
+
+    if target not in depth:
+        return None
+    return predecessors, order
+
+
+def count_shortest_paths(source, target):
+    """
+    Returns the number of distinct shortest lists of (movie_id, person_id)
+    pairs that connect the source to the target, or 0 if not connected.
+    """
+    result = shortest_path_predecessors(source, target)
+    if result is None:
+        return 0
+    predecessors, order = result
+
+    # people come in BFS order, so every predecessor is counted before its children
+    counts = {source: 1}
+    for person_id in order[1:]:
+        counts[person_id] = sum(counts[parent] for _, parent in predecessors[person_id])
+    return counts[target]
+
+
+def all_shortest_paths(source, target):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, one at a time.
+    """
+    result = shortest_path_predecessors(source, target)
+    if result is None:
+        return
+    predecessors, _ = result
+
+    # depth-first walk back from the target over one predecessor per layer
+    path = []
+    stack = [(target, iter(predecessors[target]))]
+    while stack:
+        person_id, remaining = stack[-1]
+        if person_id == source:
+            yield list(reversed(path))
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        step = next(remaining, None)
+        if step is None:
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        movie_id, parent = step
+        path.append((movie_id, person_id))
+        stack.append((parent, iter(predecessors[parent])))
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
-    resolving ambiguities as needed.
+    resolving ambiguities and misspellings as needed.
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
+        suggestions = suggest_names(name)
+        if not suggestions:
+            return None
+        print(f"No one named '{name}'. Did you mean:")
+        for i, suggestion in enumerate(suggestions):
+            person = people[next(iter(names[suggestion]))]
+            print(f"{i + 1}: {person['name']}")
+        try:
+            choice = int(input("Intended number: ")) - 1
+            if 0 <= choice < len(suggestions):
+                return person_id_for_name(suggestions[choice])
+        except ValueError:
+            pass
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
@@ -146,11 +368,26 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def suggest_names(name):
+    """
+    Returns candidate names for a name that matched no one,
+    building the name index the first time it is needed.
+    """
+    global name_index
+    if name_index is None:
+        print("Indexing names...")
+        name_index = NameIndex.build(names)
+    return name_index.suggest(name)
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return graph.neighbors(person_id)
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
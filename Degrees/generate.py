@@ -0,0 +1,103 @@
+import csv
+import os
+import random
+import sys
+from bisect import bisect_left
+from itertools import accumulate
+
+# Exponents of the power laws for cast sizes and for how often a person is cast
+CAST_EXPONENT = 2.2
+POPULARITY_EXPONENT = 0.8
+MAX_CAST = 200
+
+# Average number of films per person, used to size the set of people
+FILMS_PER_PERSON = 3
+
+FIRST_NAMES = [
+    "Alex", "Ana", "Ben", "Carla", "Chris", "Dana", "Eli", "Emma", "Finn", "Grace",
+    "Hana", "Ian", "Jade", "Kai", "Kate", "Leo", "Lena", "Max", "Mia", "Nina",
+    "Omar", "Paul", "Rosa", "Sam", "Tara", "Tom", "Uma", "Vera", "Will", "Zoe",
+]
+SYLLABLES = ["ba", "co", "de", "fi", "ga", "ho", "ki", "lu", "ma", "ne",
+             "no", "pe", "ra", "si", "ta", "vo", "we", "yo", "zu", "ster"]
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python generate.py directory stars [seed]")
+    directory = sys.argv[1]
+    stars = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) == 4 else 0
+
+    people, movies, stars = generate(directory, stars, seed)
+    print(f"Wrote {people} people, {movies} movies and {stars} stars to {directory}.")
+
+
+def generate(directory, stars, seed=0):
+    """
+    Write a synthetic people.csv, movies.csv and stars.csv to `directory`
+    with about `stars` star rows.
+
+    Cast sizes follow a power law, and people are cast with Zipf-like
+    popularity, so a few prolific actors connect most of the graph the way
+    they do in IMDB. The same `stars` and `seed` always give the same files.
+    Return the number of people, movies and star rows written.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    people = max(2, stars // FILMS_PER_PERSON)
+
+    with open(os.path.join(directory, "people.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person in range(people):
+            writer.writerow([person + 1, random_name(rng), rng.randint(1900, 2005)])
+
+    # Shuffles popularity so prolific people are spread over the id range
+    ranks = list(range(1, people + 1))
+    rng.shuffle(ranks)
+    weights = list(accumulate(rank ** -POPULARITY_EXPONENT for rank in ranks))
+    cast_weights = list(accumulate(size ** -CAST_EXPONENT for size in range(1, MAX_CAST + 1)))
+
+    movies = 0
+    written = 0
+    with open(os.path.join(directory, "movies.csv"), "w", newline="", encoding="utf-8") as movie_file, \
+            open(os.path.join(directory, "stars.csv"), "w", newline="", encoding="utf-8") as star_file:
+        movie_writer = csv.writer(movie_file)
+        star_writer = csv.writer(star_file)
+        movie_writer.writerow(["id", "title", "year"])
+        star_writer.writerow(["person_id", "movie_id"])
+        while written < stars:
+            movies += 1
+            movie_writer.writerow([movies, random_title(rng), rng.randint(1920, 2024)])
+            size = min(sample(rng, cast_weights) + 1, stars - written, people)
+            cast = set()
+            while len(cast) < size:
+                cast.add(sample(rng, weights) + 1)
+            for person in sorted(cast):
+                star_writer.writerow([person, movies])
+            written += size
+
+    return people, movies, written
+
+
+def sample(rng, cumulative_weights):
+    """
+    Return an index drawn with the given cumulative weights.
+    """
+    return bisect_left(cumulative_weights, rng.random() * cumulative_weights[-1])
+
+
+def random_name(rng):
+    last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    return f"{rng.choice(FIRST_NAMES)} {last.capitalize()}"
+
+
+def random_title(rng):
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+             for _ in range(rng.randint(1, 3))]
+    return " ".join(words)
+
+
+if __name__ == "__main__":
+    main()
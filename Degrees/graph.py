@@ -0,0 +1,272 @@
+import csv
+from array import array
+from collections import deque
+
+# Marks people a BFS tree did not reach
+UNREACHED = -1
+
+
+class CoStarGraph():
+    """
+    Compact co-star graph over dense integer ids.
+
+    People and movies are numbered in the order they appear in the CSV files.
+    `person_offsets[i]:person_offsets[i + 1]` is the slice of `person_movies`
+    holding the movies of person `i`, and `movie_offsets` / `movie_people`
+    hold the stars of each movie the same way.
+    """
+    def __init__(self, person_ids, movie_ids, person_offsets, person_movies,
+                 movie_offsets, movie_people):
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+        self.person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        self.expanded = 0
+
+    @classmethod
+    def from_csv(cls, directory, people=None, movies=None):
+        """
+        Build a graph from the CSV files in `directory`.
+        If given, `people` and `movies` are filled with the name, birth,
+        title and year of each row, without any sets of ids.
+        """
+        person_ids = []
+        person_index = {}
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                person_index[row["id"]] = len(person_ids)
+                person_ids.append(row["id"])
+                if people is not None:
+                    people[row["id"]] = {"name": row["name"], "birth": row["birth"]}
+
+        movie_ids = []
+        movie_index = {}
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                movie_index[row["id"]] = len(movie_ids)
+                movie_ids.append(row["id"])
+                if movies is not None:
+                    movies[row["id"]] = {"title": row["title"], "year": row["year"]}
+
+        # Encodes each (person, movie) pair as one integer so duplicates collapse
+        pairs = set()
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                person = person_index.get(row["person_id"])
+                movie = movie_index.get(row["movie_id"])
+                if person is not None and movie is not None:
+                    pairs.add(person * len(movie_ids) + movie)
+
+        return cls.from_pairs(person_ids, movie_ids, sorted(pairs))
+
+    @classmethod
+    def from_dicts(cls, people, movies):
+        """
+        Build a graph from the `people` and `movies` dictionaries of degrees.py.
+        """
+        person_ids = list(people)
+        movie_ids = list(movies)
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        pairs = []
+        for person, person_id in enumerate(person_ids):
+            for movie in sorted(movie_index[m] for m in people[person_id]["movies"]):
+                pairs.append(person * len(movie_ids) + movie)
+        return cls.from_pairs(person_ids, movie_ids, pairs)
+
+    @classmethod
+    def from_pairs(cls, person_ids, movie_ids, pairs):
+        """
+        Build a graph from sorted, unique `person * len(movie_ids) + movie` codes.
+        """
+        movie_count = len(movie_ids)
+
+        person_offsets = array("q", bytes(8 * (len(person_ids) + 1)))
+        person_movies = array("i", bytes(4 * len(pairs)))
+        movie_counts = array("q", bytes(8 * (movie_count + 1)))
+        for i, code in enumerate(pairs):
+            person, movie = divmod(code, movie_count)
+            person_offsets[person + 1] += 1
+            person_movies[i] = movie
+            movie_counts[movie + 1] += 1
+        for i in range(len(person_ids)):
+            person_offsets[i + 1] += person_offsets[i]
+        for i in range(movie_count):
+            movie_counts[i + 1] += movie_counts[i]
+
+        # Counting sort of the same pairs by movie
+        movie_offsets = array("q", movie_counts)
+        movie_people = array("i", bytes(4 * len(pairs)))
+        for person in range(len(person_ids)):
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                movie_people[movie_counts[movie]] = person
+                movie_counts[movie] += 1
+
+        return cls(person_ids, movie_ids, person_offsets, person_movies,
+                   movie_offsets, movie_people)
+
+    def movies_of(self, person):
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        return self.movie_people[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors(self, person_id):
+        """
+        Yields (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        for movie in self.movies_of(self.person_index[person_id]):
+            movie_id = self.movie_ids[movie]
+            for person in self.stars_of(movie):
+                yield movie_id, self.person_ids[person]
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, or None.
+        """
+        self.expanded = 0
+        source = self.person_index[source]
+        target = self.person_index[target]
+        if source == target:
+            return []
+
+        parents = {source: None}
+        seen_movies = set()
+        queue = deque([source])
+        while queue:
+            person = queue.popleft()
+            self.expanded += 1
+            for movie in self.movies_of(person):
+                # every star of a scanned movie has already been reached
+                if movie in seen_movies:
+                    continue
+                seen_movies.add(movie)
+                for star in self.stars_of(movie):
+                    if star in parents:
+                        continue
+                    parents[star] = (movie, person)
+                    if star == target:
+                        return self.path_to(target, parents)
+                    queue.append(star)
+        return None
+
+    def bfs_tree(self, source):
+        """
+        Runs a full BFS from `source` and returns its parent tree as two
+        arrays indexed by person: the person and the movie each reachable
+        person was reached from, with UNREACHED for people not reached and
+        for the source. Parents match the ones shortest_path would choose.
+        """
+        self.expanded = 0
+        source = self.person_index[source]
+        parents = array("i", [UNREACHED]) * len(self.person_ids)
+        parent_movies = array("i", [UNREACHED]) * len(self.person_ids)
+        seen_movies = set()
+        queue = deque([source])
+        while queue:
+            person = queue.popleft()
+            self.expanded += 1
+            for movie in self.movies_of(person):
+                if movie in seen_movies:
+                    continue
+                seen_movies.add(movie)
+                for star in self.stars_of(movie):
+                    if parent_movies[star] == UNREACHED and star != source:
+                        parents[star] = person
+                        parent_movies[star] = movie
+                        queue.append(star)
+        return source, parents, parent_movies
+
+    def tree_path(self, tree, target):
+        """
+        Returns the path to `target` in a tree from bfs_tree, or None.
+        """
+        source, parents, parent_movies = tree
+        person = self.person_index[target]
+        if person != source and parent_movies[person] == UNREACHED:
+            return None
+        path = []
+        while person != source:
+            path.append((self.movie_ids[parent_movies[person]], self.person_ids[person]))
+            person = parents[person]
+        path.reverse()
+        return path
+
+    def bidirectional_shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, searching from both ends
+        and always expanding the smaller layer. Returns None if not connected.
+        """
+        self.expanded = 0
+        source = self.person_index[source]
+        target = self.person_index[target]
+        if source == target:
+            return []
+
+        forward = {source: None}
+        backward = {target: None}
+        forward_movies = set()
+        backward_movies = set()
+        forward_layer = [source]
+        backward_layer = [target]
+
+        while forward_layer and backward_layer:
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self.expand_layer(
+                    forward_layer, forward, forward_movies, backward
+                )
+            else:
+                backward_layer, meeting = self.expand_layer(
+                    backward_layer, backward, backward_movies, forward
+                )
+
+            if meeting is not None:
+                path = self.path_to(meeting, forward)
+                person = meeting
+                while backward[person] is not None:
+                    movie, child = backward[person]
+                    path.append((self.movie_ids[movie], self.person_ids[child]))
+                    person = child
+                return path
+
+        return None
+
+    def expand_layer(self, layer, parents, seen_movies, opposite):
+        """
+        Expands every person in `layer`, recording parents for newly reached people.
+        Returns the next layer and a person reached by both searches, if any.
+        """
+        next_layer = []
+        for person in layer:
+            self.expanded += 1
+            for movie in self.movies_of(person):
+                if movie in seen_movies:
+                    continue
+                seen_movies.add(movie)
+                for star in self.stars_of(movie):
+                    if star in parents:
+                        continue
+                    parents[star] = (movie, person)
+                    if star in opposite:
+                        return next_layer, star
+                    next_layer.append(star)
+        return next_layer, None
+
+    def path_to(self, person, parents):
+        """
+        Follows `parents` back from `person` to the root of the search
+        and returns the (movie_id, person_id) pairs in forward order.
+        """
+        path = []
+        while parents[person] is not None:
+            movie, parent = parents[person]
+            path.append((self.movie_ids[movie], self.person_ids[person]))
+            person = parent
+        path.reverse()
+        return path
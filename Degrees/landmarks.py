@@ -0,0 +1,166 @@
+import hashlib
+import json
+import sys
+from array import array
+from collections import deque
+
+import degrees
+
+LANDMARKS = 16
+
+# Distance stored for people a landmark cannot reach
+UNREACHABLE = 0xFFFF
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python landmarks.py directory table [landmarks]")
+    count = int(sys.argv[3]) if len(sys.argv) == 4 else LANDMARKS
+
+    print("Loading data...")
+    degrees.load_data(sys.argv[1], compact=True)
+    print("Data loaded.")
+
+    print(f"Computing distances from {count} landmarks...")
+    oracle = LandmarkOracle.build(degrees.graph, count)
+    oracle.save(sys.argv[2])
+    print(f"Landmark table written to {sys.argv[2]}.")
+
+
+class LandmarkOracle():
+    """
+    Distance oracle over a CoStarGraph.
+
+    Stores the BFS distance, in degrees, from each of K landmark people
+    to every person, and bounds the distance between two people with
+    the triangle inequality in O(K).
+    """
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, count=LANDMARKS):
+        """
+        Pick the `count` people with the most co-stars as landmarks
+        and compute their distances to everyone.
+        """
+        people = len(graph.person_ids)
+        degree = [0] * people
+        for movie in range(len(graph.movie_ids)):
+            stars = graph.movie_offsets[movie + 1] - graph.movie_offsets[movie]
+            for person in graph.stars_of(movie):
+                degree[person] += stars - 1
+        landmarks = sorted(range(people), key=lambda p: -degree[p])[:count]
+        return cls(graph, landmarks, [distances_from(graph, p) for p in landmarks])
+
+    @classmethod
+    def load(cls, graph, filename):
+        """
+        Load a landmark table written by `save` for the same graph.
+        Raise ValueError if it was built from a different graph.
+        """
+        with open(filename, "rb") as f:
+            header = json.loads(f.readline())
+            if (header["people"] != len(graph.person_ids)
+                    or header.get("fingerprint") != fingerprint(graph)):
+                raise ValueError("landmark table does not match graph")
+            distances = []
+            for _ in header["landmarks"]:
+                row = array("H")
+                row.fromfile(f, header["people"])
+                distances.append(row)
+        landmarks = [graph.person_index[person_id] for person_id in header["landmarks"]]
+        return cls(graph, landmarks, distances)
+
+    def save(self, filename):
+        """
+        Write the landmark ids and distance rows to `filename`.
+        """
+        header = {
+            "people": len(self.graph.person_ids),
+            "fingerprint": fingerprint(self.graph),
+            "landmarks": [self.graph.person_ids[p] for p in self.landmarks],
+        }
+        with open(filename, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for row in self.distances:
+                row.tofile(f)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        two person_ids. Upper is None if no landmark reaches both people,
+        and both are None if a landmark shows they are not connected.
+        """
+        source = self.graph.person_index[source]
+        target = self.graph.person_index[target]
+        if source == target:
+            return 0, 0
+
+        lower = 1
+        upper = None
+        for row in self.distances:
+            to_source = row[source]
+            to_target = row[target]
+            if to_source == UNREACHABLE and to_target == UNREACHABLE:
+                continue
+            if to_source == UNREACHABLE or to_target == UNREACHABLE:
+                return None, None
+            lower = max(lower, abs(to_source - to_target))
+            if upper is None or to_source + to_target < upper:
+                upper = to_source + to_target
+        return lower, upper
+
+    def distance(self, source, target):
+        """
+        Returns the degrees of separation between two person_ids,
+        or None if they are not connected. Answers from the bounds when
+        they meet and falls back to an exact search otherwise.
+        """
+        lower, upper = self.bounds(source, target)
+        if lower is None:
+            return None
+        if lower == upper:
+            return lower
+        path = self.graph.shortest_path(source, target)
+        return None if path is None else len(path)
+
+
+def fingerprint(graph):
+    """
+    Return a hash of the person ids and co-star links of `graph`, which
+    changes if the CSV files are edited or their rows reordered.
+    """
+    digest = hashlib.sha256()
+    for person_id in graph.person_ids:
+        digest.update(person_id.encode("utf-8") + b"\0")
+    digest.update(graph.person_offsets)
+    digest.update(graph.person_movies)
+    return digest.hexdigest()
+
+
+def distances_from(graph, source):
+    """
+    Return an array of BFS distances from person `source` to every person.
+    """
+    distances = array("H", [UNREACHABLE]) * len(graph.person_ids)
+    distances[source] = 0
+    seen_movies = set()
+    queue = deque([source])
+    while queue:
+        person = queue.popleft()
+        for movie in graph.movies_of(person):
+            if movie in seen_movies:
+                continue
+            seen_movies.add(movie)
+            for star in graph.stars_of(movie):
+                if distances[star] == UNREACHABLE:
+                    distances[star] = distances[person] + 1
+                    queue.append(star)
+    return distances
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+from array import array
+from bisect import bisect_left
+from zlib import crc32
+
+MAX_DISTANCE = 2
+LIMIT = 5
+
+# Names are indexed by the deletions of a window of one of these lengths
+WINDOW_LENGTHS = (4, 5, 7)
+
+# Runs of more names are indexed again by the window after their common prefix
+RUN_LIMIT = 16
+
+# Window depths are stored in one byte per name
+MAX_DEPTH = 255 - max(WINDOW_LENGTHS)
+
+# Name ordinals fill the low bits of each delete key entry
+ORDINAL_BITS = 32
+ORDINAL_MASK = (1 << ORDINAL_BITS) - 1
+
+# Entries are sorted in buckets by the top bits of their hash, so the
+# build never holds more than one bucket as a list
+BUCKET_BITS = 8
+
+
+class NameIndex():
+    """
+    Prefix and typo-tolerant lookup over a sorted sequence of distinct
+    lowercase names.
+
+    Prefix lookups bisect the sorted names. Misspellings are found with a
+    symmetric-delete index over runs of names sharing a window of one of
+    WINDOW_LENGTHS characters, which are adjacent in sorted order. Runs of
+    more than RUN_LIMIT names are indexed again by the window after their
+    common prefix, and a crowded run keeps the shortest window where its
+    names stop sharing characters. So the thousands of names sharing a
+    common first name are one run, told apart by the characters after it,
+    and a query's deletions reach few runs even in crowded parts of the
+    index. `levels` holds the depth of each name's last window, and `keys`
+    holds the hash of every string reachable by deleting up to MAX_DISTANCE
+    characters from a run's window, salted with its depth and length and
+    shifted above the ordinal of the run's first name, sorted.
+    All three are plain sequences, so a snapshot can store them as they are.
+    """
+    def __init__(self, sorted_names, keys, levels):
+        self.sorted_names = sorted_names
+        self.keys = keys
+        self.levels = levels
+
+    @classmethod
+    def build(cls, names):
+        """
+        Build the index over the lowercase names in `names`.
+        """
+        sorted_names = sorted(names)
+        return cls(sorted_names, *delete_keys(sorted_names))
+
+    def prefix(self, prefix, limit=LIMIT):
+        """
+        Return up to `limit` names starting with `prefix`, in sorted order.
+        """
+        prefix = prefix.lower()
+        matches = []
+        i = bisect_left(self.sorted_names, prefix)
+        while (i < len(self.sorted_names) and len(matches) < limit
+               and self.sorted_names[i].startswith(prefix)):
+            matches.append(self.sorted_names[i])
+            i += 1
+        return matches
+
+    def fuzzy(self, name, max_distance=MAX_DISTANCE, limit=LIMIT):
+        """
+        Return up to `limit` (distance, name) pairs for names within
+        `max_distance` edits of `name`, closest first.
+        """
+        name = name.lower()
+        bound = min(max_distance, MAX_DISTANCE)
+        names = self.sorted_names
+
+        # Each search looks up the runs at `depth` within `lo:hi` whose
+        # window is within `budget` edits of the window at `offset` in `name`
+        searches = [(0, bound, 0, 0, len(names))]
+        leaves = []
+        seen = set()
+        while searches:
+            offset, budget, depth, lo, hi = searches.pop()
+            for length in WINDOW_LENGTHS:
+                window = name[offset:offset + length]
+                for start in self.runs(deletions(window, budget), depth, length, lo, hi):
+                    if (start, depth) in seen:
+                        continue
+                    seen.add((start, depth))
+                    end = run_end(names, start, depth + length, hi)
+                    if self.levels[start] == depth:
+                        leaves.append((start, end))
+                        continue
+
+                    # A name in the run is within `bound` edits only if its
+                    # prefix is within `cost` edits of `name[:split]` and
+                    # the rest within the remaining edits of `name[split:]`
+                    prefix = common_prefix(names[start], names[end - 1])
+                    for split, cost in prefix_distances(prefix, name, bound):
+                        if cost < bound:
+                            searches.append((split, bound - cost, len(prefix), start, end))
+                            continue
+
+                        # With no edits left the rest must match exactly
+                        i = bisect_left(names, prefix + name[split:], start, end)
+                        if i < end and names[i] == prefix + name[split:]:
+                            leaves.append((i, i + 1))
+        return sorted(set(run_matches(name, names, sorted(leaves), bound)))[:limit]
+
+    def runs(self, keys, depth, length, lo, hi):
+        """
+        Yield the first ordinal of each run in `lo:hi` whose window of
+        `length` characters at `depth` has a deletion in `keys`.
+        """
+        seed = window_seed(depth, length)
+        for key in keys:
+            key = crc32(key.encode("utf-8"), seed) << ORDINAL_BITS
+            i = bisect_left(self.keys, key | lo)
+            while i < len(self.keys) and self.keys[i] < key | hi:
+                yield self.keys[i] & ORDINAL_MASK
+                i += 1
+
+    def suggest(self, name, limit=LIMIT):
+        """
+        Return up to `limit` ranked candidate names for `name`:
+        close misspellings first, then names it is a prefix of.
+        """
+        candidates = [match for _, match in self.fuzzy(name, limit=limit)]
+        for match in self.prefix(name, limit):
+            if match not in candidates:
+                candidates.append(match)
+        return candidates[:limit]
+
+
+def window_seed(depth, length):
+    """
+    Return the CRC32 to continue from when hashing deletions of
+    windows of `length` characters at `depth`.
+    """
+    return crc32(bytes([depth, length]))
+
+
+def delete_keys(sorted_names):
+    """
+    Split `sorted_names` into runs and return the sorted array of delete
+    key entries for the runs, and the array of each name's last depth.
+    """
+    buckets = [array("Q") for _ in range(1 << BUCKET_BITS)]
+    levels = array("B", bytes(len(sorted_names)))
+    ranges = [(0, len(sorted_names), 0)]
+    while ranges:
+        start, stop, depth = ranges.pop()
+        for run, end, length in window_runs(sorted_names, start, stop, depth, WINDOW_LENGTHS):
+            if end - run > RUN_LIMIT and depth < MAX_DEPTH:
+                prefix = common_prefix(sorted_names[run], sorted_names[end - 1])
+                ranges.append((run, end, len(prefix)))
+            else:
+                levels[run:end] = array("B", [depth]) * (end - run)
+            seed = window_seed(depth, length)
+            window = sorted_names[run][depth:depth + length]
+            for key in deletions(window, MAX_DISTANCE):
+                key = crc32(key.encode("utf-8"), seed)
+                buckets[key >> 32 - BUCKET_BITS].append(key << ORDINAL_BITS | run)
+
+    keys = array("Q")
+    for bucket in buckets:
+        keys.extend(sorted(bucket))
+    return keys, levels
+
+
+def window_runs(names, start, stop, depth, lengths):
+    """
+    Split `names[start:stop]` into (start, end, length) runs sharing a
+    window of the first of `lengths` characters at `depth`, or of a later
+    one where the shorter window is not crowded.
+
+    A window is crowded when more than RUN_LIMIT names share it and no
+    longer window holds most of them, as after a common first name, where
+    longer windows would split its names into many runs that a query
+    deleting their last characters would all reach.
+    """
+    length, *longer = lengths
+    runs = []
+    for run, end in prefix_runs(names, start, stop, depth + length):
+        if longer and not crowded(names, run, end, depth + longer[0]):
+            runs.extend(window_runs(names, run, end, depth, longer))
+        else:
+            runs.append((run, end, length))
+    return runs
+
+
+def crowded(names, start, stop, length):
+    """
+    Return whether more than RUN_LIMIT names in `names[start:stop]` share a
+    window and at most half of them share their first `length` characters.
+    """
+    if stop - start <= RUN_LIMIT:
+        return False
+    return 2 * max(end - run for run, end in prefix_runs(names, start, stop, length)) <= stop - start
+
+
+def prefix_runs(names, start, stop, length):
+    """
+    Return (start, end) pairs for the runs of `names[start:stop]`
+    sharing their first `length` characters.
+    """
+    runs = []
+    while start < stop:
+        end = run_end(names, start, length, stop)
+        runs.append((start, end))
+        start = end
+    return runs
+
+
+def deletions(word, distance):
+    """
+    Return the set of strings made by deleting up to `distance` characters
+    from `word`, including `word` itself.
+    """
+    results = {word}
+
+    # Deletes positions in increasing order, so no set of deletions is applied twice
+    layer = [(word, 0)]
+    for _ in range(distance):
+        layer = [(w[:i] + w[i + 1:], i) for w, start in layer for i in range(start, len(w))]
+        results.update([w for w, _ in layer])
+    return results
+
+
+def run_end(names, start, length, stop):
+    """
+    Return the end of the run of `names` before `stop` sharing the first
+    `length` characters of `names[start]`. Shorter names are runs of their own.
+    """
+    prefix = names[start][:length]
+    if len(prefix) < length:
+        return start + 1
+    return bisect_left(names, successor(prefix), start, stop)
+
+
+def successor(prefix):
+    """
+    Return the smallest string greater than every string starting with `prefix`.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def common_prefix(first, last):
+    """
+    Return the longest common prefix of `first` and `last`, and so of
+    every name between them, up to MAX_DEPTH characters.
+    """
+    i = 0
+    while i < min(len(first), len(last), MAX_DEPTH) and first[i] == last[i]:
+        i += 1
+    return first[:i]
+
+
+def prefix_distances(prefix, name, bound):
+    """
+    Return (split, distance) pairs for the prefixes `name[:split]`
+    within `bound` edits of `prefix`.
+    """
+    row = [min(j, bound + 1) for j in range(len(name) + 1)]
+    for depth, letter in enumerate(prefix):
+        row, within = next_row(row, depth, letter, name, bound)
+        if not within:
+            return []
+    return [(split, distance) for split, distance in enumerate(row) if distance <= bound]
+
+
+def next_row(row, depth, letter, name, bound):
+    """
+    Return the Levenshtein row following `row` when `letter` is the
+    character at `depth` of a string compared with `name`, and whether any
+    of its entries is within `bound`. Rows only fill the band of cells
+    within `bound` of the diagonal, as no other cell can stay within it.
+    """
+    low = max(0, depth + 1 - bound)
+    high = min(len(name), depth + 1 + bound)
+    result = [bound + 1] * (len(name) + 1)
+    if low == 0:
+        result[0] = depth + 1
+    for j in range(max(1, low), high + 1):
+        result[j] = min(
+            result[j - 1] + 1,
+            row[j] + 1,
+            row[j - 1] + (letter != name[j - 1]),
+        )
+    return result, low <= high and min(result[low:high + 1]) <= bound
+
+
+def run_matches(name, names, runs, bound):
+    """
+    Return (distance, name) pairs for the names in the sorted (start, end)
+    `runs` of `names` within `bound` edits of `name`.
+
+    Walks the runs like a trie: Levenshtein rows are kept per character,
+    so names only compute rows past their common prefix with the previous
+    name, and once every entry in a row exceeds `bound`, all names in the
+    run sharing that prefix are skipped with a binary search.
+    """
+    rows = [[min(j, bound + 1) for j in range(len(name) + 1)]]
+    previous = ""
+    matches = []
+    for start, end in runs:
+        i = start
+        while i < end:
+            candidate = names[i]
+            if abs(len(candidate) - len(name)) > bound:
+                i += 1
+                continue
+            common = 0
+            limit = min(len(candidate), len(previous), len(rows) - 1)
+            while common < limit and candidate[common] == previous[common]:
+                common += 1
+            del rows[common + 1:]
+            previous = candidate
+
+            for depth in range(common, len(candidate)):
+                row, within = next_row(rows[depth], depth, candidate[depth], name, bound)
+                rows.append(row)
+                if not within:
+                    i = bisect_left(names, successor(candidate[:depth + 1]), i + 1, end)
+                    break
+            else:
+                if rows[-1][-1] <= bound:
+                    matches.append((rows[-1][-1], candidate))
+                i += 1
+    return matches
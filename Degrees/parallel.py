@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import degrees
+from batch import TreeCache, format_answer, read_pairs
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(flag.split("=", 1) if "=" in flag else (flag, None)
+                 for flag in sys.argv[1:] if flag.startswith("--"))
+    if len(args) != 2 or set(flags) - {"--snapshot", "--workers"}:
+        sys.exit("Usage: python parallel.py [--snapshot] [--workers=N] directory pairs.csv")
+    workers = int(flags.get("--workers") or os.cpu_count())
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args[0], compact=True, snapshot="--snapshot" in flags)
+    print("Data loaded.", file=sys.stderr)
+
+    with open(args[1], encoding="utf-8") as f:
+        pairs = list(read_pairs(f))
+
+    start = time.perf_counter()
+    answers = run_parallel(pairs, workers)
+    elapsed = time.perf_counter() - start
+
+    for (source, target), (path, latency) in zip(pairs, answers):
+        print(format_answer(source, target, path, latency))
+    print(f"{len(pairs)} queries on {workers} workers in {elapsed:.3f}s "
+          f"({len(pairs) / elapsed:.1f} queries/s)", file=sys.stderr)
+
+
+def run_parallel(pairs, workers):
+    """
+    Answer (source, target) `pairs` on a pool of `workers` processes.
+
+    Workers are forked after load_data, so they share the loaded graph
+    read-only instead of loading or pickling it. Pairs are sharded by
+    source, so each source's BFS tree is built in one worker only.
+    Return (path, latency in milliseconds) pairs in the order of `pairs`.
+    """
+    shards = [[] for _ in range(workers)]
+    loads = [0] * workers
+    by_source = {}
+    for i, (source, target) in enumerate(pairs):
+        by_source.setdefault(source, []).append((i, source, target))
+    for group in sorted(by_source.values(), key=len, reverse=True):
+        shard = loads.index(min(loads))
+        shards[shard].extend(group)
+        loads[shard] += len(group)
+
+    answers = [None] * len(pairs)
+    context = multiprocessing.get_context("fork")
+    with context.Pool(workers) as pool:
+        for results in pool.imap_unordered(answer_shard, [s for s in shards if s]):
+            for i, path, latency in results:
+                answers[i] = (path, latency)
+    return answers
+
+
+def answer_shard(shard):
+    """
+    Answer a shard of (index, source, target) queries in a worker.
+    Return (index, path, latency in milliseconds) for each query.
+    Shards keep each source's queries together, so one tree is cached at a time.
+    """
+    cache = TreeCache(degrees.graph, size=1)
+    results = []
+    for i, source, target in shard:
+        start = time.perf_counter()
+        if source is None or target is None:
+            path = None
+        else:
+            path = cache.path(source, target)
+        results.append((i, path, (time.perf_counter() - start) * 1000))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from graph import CoStarGraph
+from nameindex import NameIndex
+
+MAGIC = b"DEGSNAP3"
+FILENAME = "degrees.snapshot"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python snapshot.py directory")
+    print("Compiling snapshot...")
+    compile_snapshot(sys.argv[1])
+    print(f"Snapshot written to {snapshot_path(sys.argv[1])}.")
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, FILENAME)
+
+
+def source_stamps(directory):
+    """
+    Return the modification time and size of each source CSV,
+    used to tell whether a snapshot is still valid.
+    """
+    stamps = {}
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        stamps[filename] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def compile_snapshot(directory):
+    """
+    Parse the CSV files in `directory` and write a memory-mappable
+    snapshot of the name index, people, movies and co-star graph.
+    The fuzzy name index is stored too, so it is never rebuilt on load.
+    """
+    stamps = source_stamps(directory)
+    people = {}
+    movies = {}
+    graph = CoStarGraph.from_csv(directory, people, movies)
+    person_ids = graph.person_ids
+    movie_ids = graph.movie_ids
+    name_index = NameIndex.build({people[p]["name"].lower() for p in person_ids})
+
+    sections = {
+        "person_offsets": graph.person_offsets,
+        "person_movies": graph.person_movies,
+        "movie_offsets": graph.movie_offsets,
+        "movie_people": graph.movie_people,
+        "person_order": sorted_order(person_ids),
+        "movie_order": sorted_order(movie_ids),
+        "name_order": sorted_order([people[p]["name"].lower() for p in person_ids]),
+        "name_keys": name_index.keys,
+        "name_levels": name_index.levels,
+    }
+    for name, values in [
+        ("person_ids", person_ids),
+        ("person_names", [people[p]["name"] for p in person_ids]),
+        ("person_births", [people[p]["birth"] for p in person_ids]),
+        ("movie_ids", movie_ids),
+        ("movie_titles", [movies[m]["title"] for m in movie_ids]),
+        ("movie_years", [movies[m]["year"] for m in movie_ids]),
+        ("sorted_names", name_index.sorted_names),
+    ]:
+        sections[name + "_offsets"], sections[name] = encode_strings(values)
+
+    # Lays every section out on an 8-byte boundary after the header
+    layout = {}
+    position = 0
+    for name, values in sections.items():
+        layout[name] = [position, len(values), values.typecode]
+        position += align(len(values) * values.itemsize)
+    header = json.dumps({"sources": stamps, "sections": layout}).encode("utf-8")
+    start = align(len(MAGIC) + 8 + len(header))
+
+    temporary = snapshot_path(directory) + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<q", len(header)))
+        f.write(header)
+        for name, values in sections.items():
+            f.seek(start + layout[name][0])
+            f.write(values.tobytes())
+        f.truncate(start + position)
+    os.replace(temporary, snapshot_path(directory))
+
+
+def load_snapshot(directory):
+    """
+    Open the snapshot for `directory`, compiling it first if it is
+    missing or older than the CSV files.
+    Return the names, people, movies, graph and name index views used by degrees.py.
+    """
+    snapshot = Snapshot.open(directory)
+    if snapshot is None:
+        compile_snapshot(directory)
+        snapshot = Snapshot.open(directory)
+    graph = SnapshotGraph(snapshot)
+    name_index = NameIndex(snapshot.sorted_names, snapshot.name_keys, snapshot.name_levels)
+    return NameView(snapshot), PeopleView(snapshot), MovieView(snapshot), graph, name_index
+
+
+class Snapshot():
+    """
+    Read-only view over a memory-mapped snapshot file.
+    Sections are exposed as memoryviews and decoded on access.
+    """
+    def __init__(self, mapped, sections, start):
+        self.mapped = mapped
+        buffer = memoryview(mapped)
+        for name, (offset, length, typecode) in sections.items():
+            view = buffer[start + offset:start + offset + length * array(typecode).itemsize]
+            setattr(self, name, view.cast(typecode))
+        for name in ["person_ids", "person_names", "person_births",
+                     "movie_ids", "movie_titles", "movie_years", "sorted_names"]:
+            setattr(self, name, StringTable(getattr(self, name), getattr(self, name + "_offsets")))
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Map the snapshot for `directory`.
+        Return None if it does not exist or its source CSV files have changed.
+        """
+        try:
+            f = open(snapshot_path(directory), "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = struct.unpack("<q", f.read(8))
+            header = json.loads(f.read(length))
+            if header["sources"] != source_stamps(directory):
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, header["sections"], align(len(MAGIC) + 8 + length))
+
+
+class StringTable():
+    """
+    Sequence of strings stored as one UTF-8 blob plus offsets.
+    """
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class SortedIndex(Mapping):
+    """
+    Maps strings to the positions holding them, by binary search over
+    a permutation of `strings` that puts them in sorted order.
+    """
+    def __init__(self, strings, order, key=None):
+        self.strings = strings
+        self.order = order
+        self.key = key or (lambda value: value)
+
+    def positions(self, value):
+        def key(i):
+            return self.key(self.strings[i])
+        i = bisect_left(self.order, value, key=key)
+        positions = []
+        while i < len(self.order) and key(self.order[i]) == value:
+            positions.append(self.order[i])
+            i += 1
+        return positions
+
+    def __getitem__(self, value):
+        positions = self.positions(value)
+        if not positions:
+            raise KeyError(value)
+        return positions[0]
+
+    def __iter__(self):
+        return (self.strings[i] for i in self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+
+class SnapshotGraph(CoStarGraph):
+    """
+    CoStarGraph whose buffers live in a memory-mapped snapshot.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.person_ids = snapshot.person_ids
+        self.movie_ids = snapshot.movie_ids
+        self.person_offsets = snapshot.person_offsets
+        self.person_movies = snapshot.person_movies
+        self.movie_offsets = snapshot.movie_offsets
+        self.movie_people = snapshot.movie_people
+        self.person_index = SortedIndex(snapshot.person_ids, snapshot.person_order)
+        self.expanded = 0
+
+
+class NameView(Mapping):
+    """
+    Maps lowercase names to the set of matching person_ids.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.index = SortedIndex(snapshot.person_names, snapshot.name_order, str.lower)
+
+    def __getitem__(self, name):
+        positions = self.index.positions(name)
+        if not positions:
+            raise KeyError(name)
+        return {self.snapshot.person_ids[i] for i in positions}
+
+    def __iter__(self):
+        previous = None
+        for name in self.index:
+            if name.lower() != previous:
+                previous = name.lower()
+                yield previous
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class PeopleView(Mapping):
+    """
+    Maps person_ids to a dictionary of: name, birth.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.index = SortedIndex(snapshot.person_ids, snapshot.person_order)
+
+    def __getitem__(self, person_id):
+        i = self.index[person_id]
+        return {"name": self.snapshot.person_names[i], "birth": self.snapshot.person_births[i]}
+
+    def __iter__(self):
+        return iter(self.snapshot.person_ids[i] for i in range(len(self)))
+
+    def __len__(self):
+        return len(self.snapshot.person_ids)
+
+
+class MovieView(Mapping):
+    """
+    Maps movie_ids to a dictionary of: title, year.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.index = SortedIndex(snapshot.movie_ids, snapshot.movie_order)
+
+    def __getitem__(self, movie_id):
+        i = self.index[movie_id]
+        return {"title": self.snapshot.movie_titles[i], "year": self.snapshot.movie_years[i]}
+
+    def __iter__(self):
+        return iter(self.snapshot.movie_ids[i] for i in range(len(self)))
+
+    def __len__(self):
+        return len(self.snapshot.movie_ids)
+
+
+def sorted_order(values):
+    """
+    Return the permutation of positions that sorts `values`.
+    """
+    return array("i", sorted(range(len(values)), key=values.__getitem__))
+
+
+def encode_strings(values):
+    """
+    Return the offsets and UTF-8 blob storing `values` as a StringTable.
+    """
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, array("B", blob)
+
+
+def align(size):
+    return (size + 7) // 8 * 8
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+import heapq
+import itertools
+from collections import deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -36,3 +41,67 @@ class QueueFrontier(StackFrontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+class IndexedStackFrontier():
+    """
+    Stack frontier backed by a deque, with a count of the states it holds
+    so that add, remove and contains_state are all O(1).
+    """
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            return self.forget(self.frontier.pop())
+
+    def forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
+
+class IndexedQueueFrontier(IndexedStackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            return self.forget(self.frontier.popleft())
+
+
+class PriorityFrontier(IndexedStackFrontier):
+    """
+    Frontier that removes the node with the lowest priority first,
+    breaking ties in insertion order.
+    """
+    def __init__(self):
+        super().__init__()
+        self.frontier = []
+        self.counter = itertools.count()
+
+    def add(self, node, priority=0):
+        heapq.heappush(self.frontier, (priority, next(self.counter), node))
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            return self.forget(heapq.heappop(self.frontier)[2])
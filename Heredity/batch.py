@@ -0,0 +1,80 @@
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import elimination
+import sampling
+import vectorized
+from heredity import PROBS, enumerate_probabilities, families, load_data
+
+# Set in each worker by `initialize`
+table = None
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4] or (len(sys.argv) > 2 and sys.argv[2] not in ENGINES):
+        sys.exit(f"Usage: python batch.py directory|glob [{'|'.join(ENGINES)}] [workers]")
+    method = sys.argv[2] if len(sys.argv) > 2 else "exact"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    pattern = sys.argv[1]
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    filenames = sorted(glob.glob(pattern))
+
+    start = time.perf_counter()
+    for result in run(filenames, method, workers):
+        print(json.dumps(result), flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"{len(filenames)} files in {elapsed:.3f}s "
+          f"({len(filenames) / elapsed if elapsed else 0:.1f} files/s)", file=sys.stderr)
+
+
+def run(filenames, method="exact", workers=None):
+    """
+    Run inference on every family CSV in `filenames` across a pool of
+    `workers` processes, each of which compiles the PROBS tables once.
+    Yield one result dictionary per file, in order.
+    """
+    with ProcessPoolExecutor(workers, initializer=initialize) as executor:
+        tasks = [(filename, method) for filename in filenames]
+        yield from executor.map(infer_file, tasks, chunksize=16)
+
+
+def initialize():
+    global table
+    table = elimination.inheritance_table(PROBS)
+
+
+def infer_file(task):
+    """
+    Return the file name, per-family latency in milliseconds and
+    per-person probabilities for one family CSV.
+    """
+    filename, method = task
+    start = time.perf_counter()
+    try:
+        people = load_data(filename)
+        probabilities = {}
+        for family in families(people):
+            probabilities.update(ENGINES[method](family))
+    except (OSError, KeyError, ValueError) as error:
+        return {"file": filename, "error": str(error)}
+    latency = (time.perf_counter() - start) * 1000
+    return {"file": filename, "latency_ms": round(latency, 3), "probabilities": probabilities}
+
+
+ENGINES = {
+    "enumerate": enumerate_probabilities,
+    "exact": lambda people: elimination.probabilities(people, PROBS, table),
+    "vectorized": lambda people: vectorized.probabilities(people, PROBS, table),
+    "weighting": lambda people: sampling.likelihood_weighting(people, PROBS, table=table)[0],
+    "gibbs": lambda people: sampling.gibbs(people, PROBS, table=table)[0],
+}
+
+
+if __name__ == "__main__":
+    main()
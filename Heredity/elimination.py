@@ -0,0 +1,287 @@
+import itertools
+
+GENES = (2, 1, 0)
+
+
+class Factor():
+    """
+    Table over the gene counts of some people.
+    `values` maps each tuple of gene counts, in the order of `variables`,
+    to a non-negative weight.
+    """
+    def __init__(self, variables, values):
+        self.variables = tuple(variables)
+        self.values = values
+
+    def multiply(self, other):
+        variables = self.variables + tuple(
+            v for v in other.variables if v not in self.variables
+        )
+        own = [variables.index(v) for v in self.variables]
+        theirs = [variables.index(v) for v in other.variables]
+        values = {}
+        for assignment in itertools.product(GENES, repeat=len(variables)):
+            values[assignment] = (
+                self.values[tuple(assignment[i] for i in own)] *
+                other.values[tuple(assignment[i] for i in theirs)]
+            )
+        return Factor(variables, values)
+
+    def project(self, variables):
+        """
+        Sum out every variable not in `variables`, keeping their order.
+        Variables this factor does not mention are constant in the result.
+        """
+        present = [v for v in variables if v in self.variables]
+        positions = [self.variables.index(v) for v in present]
+        values = dict.fromkeys(itertools.product(GENES, repeat=len(positions)), 0)
+        for assignment, p in self.values.items():
+            values[tuple(assignment[i] for i in positions)] += p
+        if len(present) == len(variables):
+            return Factor(variables, values)
+        kept = [variables.index(v) for v in present]
+        return Factor(variables, {
+            assignment: values[tuple(assignment[i] for i in kept)]
+            for assignment in itertools.product(GENES, repeat=len(variables))
+        })
+
+    def normalize(self):
+        total = sum(self.values.values())
+        return Factor(self.variables, {
+            assignment: p / total for assignment, p in self.values.items()
+        })
+
+
+def passing_probability(genes, probs):
+    """
+    Return the probability that a parent with `genes` copies passes the gene on.
+    """
+    if genes == 2:
+        return 1 - probs["mutation"]
+    elif genes == 1:
+        return 0.5
+    return probs["mutation"]
+
+
+def inheritance_table(probs):
+    """
+    Return a dictionary mapping (mother genes, father genes, child genes)
+    to the probability of the child's gene count given its parents'.
+    """
+    table = {}
+    for mother, father in itertools.product(GENES, repeat=2):
+        m = passing_probability(mother, probs)
+        f = passing_probability(father, probs)
+        table[mother, father, 2] = m * f
+        table[mother, father, 1] = m * (1 - f) + f * (1 - m)
+        table[mother, father, 0] = (1 - m) * (1 - f)
+    return table
+
+
+def evidence_weight(person, genes, probs):
+    """
+    Return the probability of `person`'s known trait given `genes`,
+    or 1 if the trait is unknown.
+    """
+    if person["trait"] is None:
+        return 1
+    return probs["trait"][genes][person["trait"]]
+
+
+def person_factor(person, probs, table):
+    """
+    Return the factor for one person's gene count given their parents',
+    with the likelihood of their known trait folded in.
+    """
+    name = person["name"]
+    if person["mother"] is None:
+        return Factor((name,), {
+            (genes,): probs["gene"][genes] * evidence_weight(person, genes, probs)
+            for genes in GENES
+        })
+    variables = (person["mother"], person["father"], name)
+    return Factor(variables, {
+        (mother, father, genes):
+            table[mother, father, genes] * evidence_weight(person, genes, probs)
+        for mother, father, genes in itertools.product(GENES, repeat=3)
+    })
+
+
+def interaction_graph(factors):
+    """
+    Return a dictionary mapping each variable to the set of variables
+    it shares a factor with.
+    """
+    neighbors = {}
+    for factor in factors:
+        for v in factor.variables:
+            neighbors.setdefault(v, set()).update(factor.variables)
+    for v in neighbors:
+        neighbors[v].discard(v)
+    return neighbors
+
+
+def elimination_order(factors):
+    """
+    Return the variables in greedy min-degree order,
+    which keeps the intermediate factors close to the treewidth.
+    """
+    neighbors = interaction_graph(factors)
+    order = []
+    remaining = set(neighbors)
+    while remaining:
+        v = min(remaining, key=lambda v: (len(neighbors[v]), v))
+        for u in neighbors[v]:
+            neighbors[u] |= neighbors[v] - {u}
+            neighbors[u].discard(v)
+        remaining.remove(v)
+        order.append(v)
+    return order
+
+
+def product(factors):
+    result = Factor((), {(): 1})
+    for factor in factors:
+        result = result.multiply(factor)
+    return result
+
+
+class CliqueTree():
+    """
+    Junction tree over the gene counts of a pedigree, for every person's
+    marginal from one pass of messages instead of one elimination each.
+
+    Eliminating every variable in `elimination_order` gives one clique per
+    person: the person and their neighbors when eliminated. A clique's
+    parent is the clique of the first of those neighbors to be eliminated,
+    so parents always come later in the order, and each factor belongs
+    to the clique of the first of its variables to be eliminated.
+
+    Messages up to each parent and down to each child are cached.
+    Replacing one person's factor with `set_factor` discards only the
+    messages that depend on it: those up from its clique to the root, and
+    those down towards every other clique of the same tree.
+    """
+    def __init__(self, factors):
+        """
+        `factors` maps each person to the factor holding their gene count
+        given their parents', as returned by `person_factor`.
+        """
+        factors = dict(factors)
+        self.order = elimination_order(factors.values())
+        position = {v: i for i, v in enumerate(self.order)}
+
+        neighbors = interaction_graph(factors.values())
+        self.cliques = {}
+        self.parent = {}
+        for v in self.order:
+            self.cliques[v] = (v,) + tuple(sorted(neighbors[v], key=position.get))
+            self.parent[v] = self.cliques[v][1] if len(self.cliques[v]) > 1 else None
+            for u in neighbors[v]:
+                neighbors[u] |= neighbors[v] - {u}
+                neighbors[u].discard(v)
+
+        self.children = {v: [] for v in self.order}
+        self.root = {}
+        for v in reversed(self.order):
+            if self.parent[v] is not None:
+                self.children[self.parent[v]].append(v)
+            self.root[v] = v if self.parent[v] is None else self.root[self.parent[v]]
+        self.members = {}
+        for v in self.order:
+            self.members.setdefault(self.root[v], []).append(v)
+
+        self.home = {
+            name: min(factor.variables, key=position.get)
+            for name, factor in factors.items()
+        }
+        self.factors = factors
+        self.up = {}
+        self.down = {}
+        self.marginals = {}
+
+    def set_factor(self, name, factor):
+        """
+        Replace `name`'s factor, which must have the same variables,
+        and discard the messages and marginals that depended on it.
+        """
+        self.factors[name] = factor
+        clique = self.home[name]
+        path = set()
+        while clique is not None:
+            path.add(clique)
+            self.up.pop(clique, None)
+            root = clique
+            clique = self.parent[clique]
+        for v in self.members[root]:
+            if v not in path:
+                self.down.pop(v, None)
+            self.marginals.pop(v, None)
+
+    def marginal(self, person):
+        """
+        Return the normalized distribution of `person`'s gene count.
+        """
+        if person not in self.marginals:
+            self.calibrate()
+        return self.marginals[person]
+
+    def calibrate(self):
+        """
+        Recompute every discarded message, children before parents on the
+        way up and parents before children on the way down, then every
+        discarded marginal from its clique's belief.
+        """
+        assigned = {v: [] for v in self.order}
+        for name, factor in self.factors.items():
+            assigned[self.home[name]].append(factor)
+
+        def incoming(v, exclude=None):
+            factors = list(assigned[v])
+            if self.parent[v] is not None:
+                factors.append(self.down[v])
+            factors.extend(self.up[c] for c in self.children[v] if c != exclude)
+            return factors
+
+        # Messages are normalized, which keeps large pedigrees from underflowing
+        for v in self.order:
+            if self.parent[v] is not None and v not in self.up:
+                factors = list(assigned[v]) + [self.up[c] for c in self.children[v]]
+                self.up[v] = product(factors).project(self.cliques[v][1:]).normalize()
+        for v in reversed(self.order):
+            if self.parent[v] is not None and v not in self.down:
+                factors = incoming(self.parent[v], exclude=v)
+                self.down[v] = product(factors).project(self.cliques[v][1:]).normalize()
+        for v in self.order:
+            if v not in self.marginals:
+                belief = product(incoming(v)).project((v,)).normalize()
+                self.marginals[v] = {genes: belief.values[(genes,)] for genes in GENES}
+
+
+def probabilities(people, probs, table=None):
+    """
+    Return every person's gene and trait distribution given the known traits,
+    in the same format as `heredity.enumerate_probabilities`.
+    `table` is an `inheritance_table` to reuse, built from `probs` if None.
+    """
+    if table is None:
+        table = inheritance_table(probs)
+    tree = CliqueTree({
+        name: person_factor(people[name], probs, table) for name in people
+    })
+
+    results = {}
+    for name, person in people.items():
+        gene = tree.marginal(name)
+        results[name] = {"gene": gene, "trait": trait_distribution(person, gene, probs)}
+    return results
+
+
+def trait_distribution(person, gene, probs):
+    """
+    Return a person's trait distribution given their gene distribution.
+    """
+    if person["trait"] is not None:
+        return {True: float(person["trait"]), False: float(not person["trait"])}
+    p = sum(gene[genes] * probs["trait"][genes][True] for genes in GENES)
+    return {True: p, False: 1 - p}
@@ -1,6 +1,12 @@
 import csv
+import functools
 import itertools
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import elimination
+import sampling
+import vectorized
 
 PROBS = {
 
@@ -40,9 +46,49 @@ PROBS = {
 def main():
 
     # Check for proper usage
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python heredity.py data.csv")
-    people = load_data(sys.argv[1])
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    flags = dict(flag.split("=", 1) if "=" in flag else (flag, None)
+                 for flag in sys.argv[1:] if flag.startswith("--"))
+    if (len(args) not in [1, 2, 3] or
+            (len(args) > 1 and args[1] not in METHODS) or
+            (len(args) > 2 and not args[2].isdigit()) or
+            set(flags) - {"--samples", "--seconds", "--seed"}):
+        sys.exit(f"Usage: python heredity.py data.csv [{'|'.join(METHODS)}] [workers] "
+                 "[--samples=N] [--seconds=S] [--seed=N]")
+    people = load_data(args[0])
+    method = METHODS[args[1] if len(args) > 1 else "enumerate"]
+    workers = int(args[2]) if len(args) > 2 else 1
+
+    # Sampling budget and seed, for the weighting and gibbs methods
+    if method in (weighting_probabilities, gibbs_probabilities):
+        method = functools.partial(
+            method,
+            samples=int(flags.get("--samples") or sampling.SAMPLES),
+            seconds=float(flags["--seconds"]) if flags.get("--seconds") else None,
+            seed=int(flags.get("--seed") or 0),
+        )
+
+    probabilities, errors = infer(people, method, workers)
+
+    # Print results, with standard errors for sampled estimates
+    for person in people:
+        print(f"{person}:")
+        for field in probabilities[person]:
+            print(f"  {field.capitalize()}:")
+            for value in probabilities[person][field]:
+                p = probabilities[person][field][value]
+                if person in errors:
+                    print(f"    {value}: {p:.4f} ± {errors[person][field][value]:.4f}")
+                else:
+                    print(f"    {value}: {p:.4f}")
+
+
+def enumerate_probabilities(people):
+    """
+    Compute every person's gene and trait distribution by enumerating
+    all joint assignments consistent with the known traits.
+    Exponential in the number of people, but kept as the reference result.
+    """
 
     # Keep track of gene and trait probabilities for each person
     probabilities = {
@@ -83,15 +129,39 @@ def main():
 
     # Ensure probabilities sum to 1
     normalize(probabilities)
+    return probabilities
 
-    # Print results
-    for person in people:
-        print(f"{person}:")
-        for field in probabilities[person]:
-            print(f"  {field.capitalize()}:")
-            for value in probabilities[person][field]:
-                p = probabilities[person][field][value]
-                print(f"    {value}: {p:.4f}")
+
+def exact_probabilities(people):
+    """
+    Compute every person's gene and trait distribution by variable
+    elimination, in time exponential only in the pedigree's treewidth.
+    """
+    return elimination.probabilities(people, PROBS)
+
+
+def vectorized_probabilities(people):
+    """
+    Compute every person's gene and trait distribution by enumerating
+    all gene assignments in chunks of NumPy arrays.
+    """
+    return vectorized.probabilities(people, PROBS)
+
+
+def weighting_probabilities(people, samples=sampling.SAMPLES, seconds=None, seed=0):
+    """
+    Estimate every person's gene and trait distribution by likelihood weighting.
+    Return the estimates and their standard errors.
+    """
+    return sampling.likelihood_weighting(people, PROBS, samples, seconds, seed)
+
+
+def gibbs_probabilities(people, samples=sampling.SAMPLES, seconds=None, seed=0):
+    """
+    Estimate every person's gene and trait distribution by Gibbs sampling.
+    Return the estimates and their standard errors.
+    """
+    return sampling.gibbs(people, PROBS, samples, seconds, seed)
 
 
 def load_data(filename):
@@ -116,6 +186,67 @@ def load_data(filename):
     return data
 
 
+def families(people):
+    """
+    Split `people` into independent families, the connected components
+    of the mother/father graph, each a dictionary in the format of `load_data`.
+    """
+    relatives = {person: set() for person in people}
+    for person, data in people.items():
+        for parent in (data["mother"], data["father"]):
+            if parent is not None:
+                relatives[person].add(parent)
+                relatives[parent].add(person)
+
+    # Labels each person with the index of their component
+    component = {}
+    count = 0
+    for person in people:
+        if person in component:
+            continue
+        component[person] = count
+        stack = [person]
+        while stack:
+            member = stack.pop()
+            for relative in relatives[member]:
+                if relative not in component:
+                    component[relative] = count
+                    stack.append(relative)
+        count += 1
+
+    components = [{} for _ in range(count)]
+    for name, data in people.items():
+        components[component[name]][name] = data
+    return components
+
+
+def infer(people, method, workers=1):
+    """
+    Run the inference `method` on each independent family in `people`,
+    across `workers` processes if more than one, and merge the results
+    into a single probabilities dictionary in the order of `people`.
+
+    Sampling methods return their estimates with standard errors, which
+    are merged the same way. Return the probabilities and the standard
+    errors, which are empty for exact methods.
+    """
+    components = families(people)
+    if workers > 1 and len(components) > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(method, components))
+    else:
+        results = [method(component) for component in components]
+
+    merged = {}
+    errors = {}
+    for result in results:
+        if isinstance(result, tuple):
+            result, result_errors = result
+            errors.update(result_errors)
+        merged.update(result)
+    return {person: merged[person] for person in people}, errors
+
+
 def powerset(s):
     """
     Return a list of all possible subsets of set s.
@@ -236,5 +367,15 @@ def normalize(probabilities):
                     value[values] = (value[values] / (gene_total / 100)) / 100
 
 
+# Inference methods selectable from the command line
+METHODS = {
+    "enumerate": enumerate_probabilities,
+    "exact": exact_probabilities,
+    "vectorized": vectorized_probabilities,
+    "weighting": weighting_probabilities,
+    "gibbs": gibbs_probabilities,
+}
+
+
 if __name__ == "__main__":
     main()
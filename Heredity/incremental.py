@@ -0,0 +1,46 @@
+import elimination
+from heredity import PROBS
+
+
+class PedigreeQuery():
+    """
+    Posterior gene and trait distributions of a pedigree under changing
+    trait evidence.
+
+    Builds the pedigree's clique tree once and keeps its messages.
+    Changing one person's trait replaces only that person's factor, and
+    the next query recomputes only the messages and marginals that
+    depended on it, within that person's family.
+    """
+    def __init__(self, people, probs=PROBS, table=None):
+        self.people = {name: dict(person) for name, person in people.items()}
+        self.probs = probs
+        self.table = table or elimination.inheritance_table(probs)
+        self.tree = elimination.CliqueTree({
+            name: elimination.person_factor(person, probs, self.table)
+            for name, person in self.people.items()
+        })
+
+    def set_evidence(self, person, trait):
+        """
+        Set `person`'s known trait to True or False, or None if unknown.
+        """
+        if self.people[person]["trait"] == trait:
+            return
+        self.people[person]["trait"] = trait
+        self.tree.set_factor(
+            person, elimination.person_factor(self.people[person], self.probs, self.table)
+        )
+
+    def marginals(self):
+        """
+        Return every person's gene and trait distribution, in the format of
+        `heredity.enumerate_probabilities`, recomputing only what the
+        evidence changed since the last call.
+        """
+        results = {}
+        for name, person in self.people.items():
+            gene = self.tree.marginal(name)
+            trait = elimination.trait_distribution(person, gene, self.probs)
+            results[name] = {"gene": gene, "trait": trait}
+        return results
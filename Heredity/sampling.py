@@ -0,0 +1,235 @@
+import math
+import random
+import time
+
+from elimination import GENES, evidence_weight, inheritance_table
+
+SAMPLES = 10000
+BURN_IN = 200
+BATCHES = 20
+
+
+def likelihood_weighting(people, probs, samples=SAMPLES, seconds=None, seed=0, table=None):
+    """
+    Estimate every person's gene and trait distribution by likelihood
+    weighting: sample everyone's gene count from the prior, parents first,
+    and weight each sample by the likelihood of the known traits.
+
+    Stops after `samples` samples, or after `seconds` if given, whichever
+    comes first. Return the distributions, in the format of
+    `heredity.enumerate_probabilities`, and their standard errors.
+    Standard errors come from the spread of estimates over batches of
+    samples, so they stay honest when a few weights dominate.
+    `table` is an `inheritance_table` to reuse, built from `probs` if None.
+    """
+    rng = random.Random(seed)
+    if table is None:
+        table = inheritance_table(probs)
+    order = topological_order(people)
+    deadline = None if seconds is None else time.perf_counter() + seconds
+
+    batch_size = max(1, samples // BATCHES)
+    batches = []
+    batch = Totals(people)
+    count = 0
+    while count < samples and not expired(deadline, count):
+        genes = {}
+        weight = 1
+        for name in order:
+            person = people[name]
+            genes[name] = draw(rng, prior(person, genes, probs, table))
+            weight *= evidence_weight(person, genes[name], probs)
+        batch.add(genes, weight, probs)
+        count += 1
+        if count % batch_size == 0:
+            batches.append(batch)
+            batch = Totals(people)
+
+    if count % batch_size:
+        batches.append(batch)
+
+    # Pools every sample for the estimate itself, which weights batches by their total weight
+    _, errors = batch_means(people, batches)
+    pooled = Totals(people)
+    for batch in batches:
+        pooled.merge(batch)
+    return pooled.estimates(), errors
+
+
+def gibbs(people, probs, samples=SAMPLES, seconds=None, seed=0, burn_in=BURN_IN,
+          table=None):
+    """
+    Estimate every person's gene and trait distribution with a Gibbs
+    sampler over gene counts, resampling one person at a time given
+    their parents, their children and their children's other parents.
+
+    Keeps `samples` sweeps after `burn_in` discarded ones, or stops after
+    `seconds` if given. Standard errors come from batch means, so they
+    account for the correlation between successive sweeps.
+    `table` is an `inheritance_table` to reuse, built from `probs` if None.
+    """
+    rng = random.Random(seed)
+    if table is None:
+        table = inheritance_table(probs)
+    order = topological_order(people)
+    children = {name: [] for name in people}
+    for name, person in people.items():
+        if person["mother"] is not None:
+            children[person["mother"]].append(name)
+            children[person["father"]].append(name)
+    deadline = None if seconds is None else time.perf_counter() + seconds
+
+    # Starts from a forward sample of the prior
+    genes = {}
+    for name in order:
+        genes[name] = draw(rng, prior(people[name], genes, probs, table))
+
+    batch_size = max(1, samples // BATCHES)
+    batches = []
+    batch = Totals(people)
+    kept = 0
+    count = 0
+    while count < burn_in + samples and not expired(deadline, count):
+        for name in order:
+            weights = []
+            for value in GENES:
+                genes[name] = value
+                weight = prior(people[name], genes, probs, table)[value]
+                weight *= evidence_weight(people[name], value, probs)
+                for child in children[name]:
+                    mother = genes[people[child]["mother"]]
+                    father = genes[people[child]["father"]]
+                    weight *= table[mother, father, genes[child]]
+                weights.append(weight)
+            genes[name] = draw(rng, dict(zip(GENES, weights)))
+        count += 1
+
+        if count > burn_in:
+            batch.add(genes, 1, probs)
+            kept += 1
+            if kept % batch_size == 0:
+                batches.append(batch)
+                batch = Totals(people)
+
+    if kept % batch_size:
+        batches.append(batch)
+    return batch_means(people, batches)
+
+
+def topological_order(people):
+    """
+    Return the names in `people` ordered so parents come before their children.
+    """
+    order = []
+    placed = set()
+    remaining = list(people)
+    while remaining:
+        waiting = []
+        for name in remaining:
+            person = people[name]
+            if person["mother"] is None or (
+                    person["mother"] in placed and person["father"] in placed):
+                order.append(name)
+                placed.add(name)
+            else:
+                waiting.append(name)
+        if len(waiting) == len(remaining):
+            raise ValueError("pedigree contains a cycle")
+        remaining = waiting
+    return order
+
+
+def prior(person, genes, probs, table):
+    """
+    Return the distribution of a person's gene count given their parents' `genes`.
+    """
+    if person["mother"] is None:
+        return probs["gene"]
+    mother = genes[person["mother"]]
+    father = genes[person["father"]]
+    return {value: table[mother, father, value] for value in GENES}
+
+
+def draw(rng, distribution):
+    """
+    Return a value drawn from a dictionary of (possibly unnormalized) weights.
+    """
+    threshold = rng.random() * sum(distribution.values())
+    for value, weight in distribution.items():
+        threshold -= weight
+        if threshold < 0:
+            return value
+    return value
+
+
+def expired(deadline, count):
+    # Checks the clock every 100 samples to keep timing off the hot path
+    return deadline is not None and count % 100 == 0 and time.perf_counter() > deadline
+
+
+class Totals():
+    """
+    Running weighted sums of gene indicators and trait probabilities
+    for one batch of samples.
+    """
+    def __init__(self, people):
+        self.people = people
+        self.weight = 0
+        self.sums = {name: {"gene": dict.fromkeys(GENES, 0), "trait": 0} for name in people}
+
+    def add(self, genes, weight, probs):
+        self.weight += weight
+        for name, value in genes.items():
+            self.sums[name]["gene"][value] += weight
+
+            # Uses P(trait | genes) rather than a sampled trait, which lowers variance
+            self.sums[name]["trait"] += weight * trait_probability(self.people[name], value, probs)
+
+    def merge(self, other):
+        self.weight += other.weight
+        for name, sums in other.sums.items():
+            for value in GENES:
+                self.sums[name]["gene"][value] += sums["gene"][value]
+            self.sums[name]["trait"] += sums["trait"]
+
+    def estimates(self):
+        results = {}
+        for name, sums in self.sums.items():
+            trait = sums["trait"] / self.weight if self.weight else 0
+            results[name] = {
+                "gene": {value: (sums["gene"][value] / self.weight if self.weight else 0)
+                         for value in GENES},
+                "trait": {True: trait, False: 1 - trait},
+            }
+        return results
+
+
+def trait_probability(person, genes, probs):
+    if person["trait"] is not None:
+        return float(person["trait"])
+    return probs["trait"][genes][True]
+
+
+def batch_means(people, batches):
+    """
+    Return the mean of the batch estimates and the standard error of that mean.
+    Batches whose samples all had zero weight are skipped.
+    """
+    estimates = [batch.estimates() for batch in batches if batch.weight]
+    results = {}
+    errors = {}
+    for name in people:
+        results[name] = {"gene": {}, "trait": {}}
+        errors[name] = {"gene": {}, "trait": {}}
+        for field, values in [("gene", GENES), ("trait", (True, False))]:
+            for value in values:
+                samples = [estimate[name][field][value] for estimate in estimates]
+                mean = sum(samples) / len(samples) if samples else 0
+                if len(samples) > 1:
+                    variance = sum((x - mean) ** 2 for x in samples) / (len(samples) - 1)
+                    error = math.sqrt(variance / len(samples))
+                else:
+                    error = math.inf
+                results[name][field][value] = mean
+                errors[name][field][value] = error
+    return results, errors
@@ -0,0 +1,74 @@
+import numpy as np
+
+from elimination import GENES, inheritance_table
+
+CHUNK_SIZE = 1 << 16
+
+
+def probabilities(people, probs, table=None, chunk_size=CHUNK_SIZE):
+    """
+    Return every person's gene and trait distribution given the known traits,
+    in the same format as `heredity.enumerate_probabilities`.
+
+    Enumerates all 3^n gene assignments like the reference method, but
+    `chunk_size` assignments at a time as rows of an integer array, with
+    every factor looked up from precomputed PROBS tables. Unknown traits
+    are summed out analytically instead of being enumerated.
+    `table` is an `inheritance_table` to reuse, built from `probs` if None.
+    """
+    names = list(people)
+    n = len(names)
+    index = {name: i for i, name in enumerate(names)}
+    founders = np.array([i for i, name in enumerate(names) if people[name]["mother"] is None],
+                        dtype=np.int64)
+    children = np.array([i for i, name in enumerate(names) if people[name]["mother"] is not None],
+                        dtype=np.int64)
+    mothers = np.array([index[people[names[i]]["mother"]] for i in children], dtype=np.int64)
+    fathers = np.array([index[people[names[i]]["father"]] for i in children], dtype=np.int64)
+
+    # Tables indexed by gene count
+    prior = np.array([probs["gene"][genes] for genes in range(3)])
+    if table is None:
+        table = inheritance_table(probs)
+    inherit = np.array([[[table[m, f, c] for c in range(3)] for f in range(3)] for m in range(3)])
+    trait = np.array([probs["trait"][genes][True] for genes in range(3)])
+    evidence = np.ones((n, 3))
+    for i, name in enumerate(names):
+        if people[name]["trait"] is not None:
+            evidence[i] = [probs["trait"][genes][people[name]["trait"]] for genes in range(3)]
+
+    gene_totals = np.zeros(3 * n)
+    trait_totals = np.zeros(n)
+    powers = 3 ** np.arange(n, dtype=np.int64)
+    offsets = 3 * np.arange(n)
+    for start in range(0, 3 ** n, chunk_size):
+        assignments = np.arange(start, min(start + chunk_size, 3 ** n), dtype=np.int64)
+        genes = assignments[:, None] // powers % 3
+
+        factors = evidence[np.arange(n), genes]
+        factors[:, founders] *= prior[genes[:, founders]]
+        factors[:, children] *= inherit[genes[:, mothers], genes[:, fathers], genes[:, children]]
+        p = factors.prod(axis=1)
+
+        gene_totals += np.bincount(
+            (genes + offsets).ravel(),
+            weights=np.broadcast_to(p[:, None], genes.shape).ravel(),
+            minlength=3 * n,
+        )
+        trait_totals += (p[:, None] * trait[genes]).sum(axis=0)
+
+    gene_totals = gene_totals.reshape(n, 3)
+    results = {}
+    for i, name in enumerate(names):
+        total = gene_totals[i].sum()
+        known = people[name]["trait"]
+        if known is None:
+            p = trait_totals[i] / total
+            trait_distribution = {True: float(p), False: float(1 - p)}
+        else:
+            trait_distribution = {True: float(known), False: float(not known)}
+        results[name] = {
+            "gene": {genes: float(gene_totals[i, genes] / total) for genes in GENES},
+            "trait": trait_distribution,
+        }
+    return results
@@ -0,0 +1,107 @@
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from linkgraph import LinkGraph, power_iteration
+
+LINK = re.compile(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+CHUNK_SIZE = 1 << 16
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python crawler.py corpus [workers]")
+    workers = int(sys.argv[2]) if len(sys.argv) == 3 else None
+
+    graph, stats = crawl_graph(sys.argv[1], workers)
+    print(f"Crawled {stats['pages']} pages and {stats['links']} links "
+          f"in {stats['seconds']:.3f}s ({stats['pages_per_second']:.0f} pages/s, "
+          f"{stats['bytes_per_second'] / 1e6:.1f} MB/s)")
+
+    ranks, iterations, _ = power_iteration(graph, 0.85)
+    print(f"PageRank Results from Sparse Iteration ({iterations} iterations)")
+    for page, rank in sorted(graph.to_dict(ranks).items()):
+        print(f"  {page}: {rank:.4f}")
+
+
+def crawl_graph(directory, workers=None, processes=False):
+    """
+    Parse a directory of HTML pages concurrently and return a LinkGraph
+    of the links between them, along with crawl statistics.
+
+    Files are read in fixed-size chunks on a thread pool, or a process
+    pool if `processes` is True, so no page is ever held in memory whole.
+    Links are kept as integer edges, and only links to other pages in
+    the corpus are kept, as in `crawl`.
+    """
+    start = time.perf_counter()
+    pages = sorted(
+        entry.name for entry in os.scandir(directory)
+        if entry.name.endswith(".html")
+    )
+    index = {page: i for i, page in enumerate(pages)}
+    paths = [os.path.join(directory, page) for page in pages]
+
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    sources = []
+    targets = []
+    total_bytes = 0
+    with pool(workers) as executor:
+        results = executor.map(extract_links, paths, chunksize=64 if processes else 1)
+        for source, (links, size) in enumerate(results):
+            total_bytes += size
+            for link in links:
+                target = index.get(link)
+                if target is not None and target != source:
+                    sources.append(source)
+                    targets.append(target)
+
+    graph = LinkGraph(
+        pages,
+        np.array(sources, dtype=np.int32),
+        np.array(targets, dtype=np.int32),
+    )
+    seconds = time.perf_counter() - start
+    stats = {
+        "pages": len(pages),
+        "links": len(sources),
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "pages_per_second": len(pages) / seconds if seconds else 0,
+        "bytes_per_second": total_bytes / seconds if seconds else 0,
+    }
+    return graph, stats
+
+
+def extract_links(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream the file at `path` and return the set of links it contains,
+    along with its size in bytes.
+    """
+    links = set()
+    tail = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = tail + chunk
+
+            # Tags that start before the last "<" are complete, so only
+            # the text from there on needs to wait for the next chunk
+            cut = buffer.rfind("<")
+            if cut == -1:
+                cut = len(buffer)
+            links.update(LINK.findall(buffer, 0, cut))
+            tail = buffer[cut:]
+    links.update(LINK.findall(tail))
+    return links, size
+
+
+if __name__ == "__main__":
+    main()
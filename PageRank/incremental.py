@@ -0,0 +1,102 @@
+import numpy as np
+
+from linkgraph import LinkGraph, power_iteration, TOLERANCE
+
+
+class IncrementalPageRank():
+    """
+    PageRank of a corpus that changes over time.
+
+    Keeps the corpus links and the last rank vector, applies page and
+    link changes to them, and warm-starts power iteration from the
+    previous ranks instead of from a uniform vector.
+    """
+    def __init__(self, corpus, damping_factor, tolerance=TOLERANCE):
+        self.corpus = {page: set(links) for page, links in corpus.items()}
+        self.damping_factor = damping_factor
+        self.tolerance = tolerance
+        self.ranks = {}
+        self.iterations = 0
+        self.residual = 0.0
+        self.recompute(cold_start=True)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a corpus and rank vector saved with `save`.
+        """
+        data = np.load(filename)
+        names = [str(name) for name in data["names"]]
+        pages = [names[i] for i in data["pages"]]
+        state = cls.__new__(cls)
+        state.corpus = {page: set() for page in pages}
+        for source, target in zip(data["sources"], data["targets"]):
+            state.corpus[names[source]].add(names[target])
+        state.damping_factor = float(data["damping_factor"])
+        state.tolerance = float(data["tolerance"])
+        state.ranks = dict(zip(pages, data["ranks"].tolist()))
+        state.iterations = 0
+        state.residual = 0.0
+        return state
+
+    def save(self, filename):
+        """
+        Write the corpus links and current ranks to `filename` as a NumPy .npz file.
+        Links are stored as indexes into a table of page names that also holds
+        linked pages outside the corpus, so they still count once added.
+        """
+        names = sorted(set(self.corpus).union(*self.corpus.values()))
+        index = {name: i for i, name in enumerate(names)}
+        pages = sorted(self.corpus)
+        sources = [index[page] for page in pages for link in self.corpus[page]]
+        targets = [index[link] for page in pages for link in self.corpus[page]]
+        np.savez(
+            filename,
+            names=np.array(names),
+            pages=np.array([index[page] for page in pages], dtype=np.int64),
+            sources=np.array(sources, dtype=np.int64),
+            targets=np.array(targets, dtype=np.int64),
+            ranks=np.array([self.ranks[page] for page in pages]),
+            damping_factor=self.damping_factor,
+            tolerance=self.tolerance,
+        )
+
+    def update(self, add_pages=(), remove_pages=(), add_links=(), remove_links=(),
+               cold_start=False):
+        """
+        Apply changes to the corpus and recompute ranks.
+
+        `add_links` and `remove_links` are (page, linked page) pairs. Links
+        to pages that are not in the corpus are kept, and count once the
+        page is added, as with `crawl`. Removing a page also removes the
+        links to it. Return the number of iterations taken to converge.
+        """
+        for page in add_pages:
+            self.corpus.setdefault(page, set())
+        for page in remove_pages:
+            self.corpus.pop(page, None)
+            for links in self.corpus.values():
+                links.discard(page)
+        for page, link in add_links:
+            self.corpus.setdefault(page, set()).add(link)
+        for page, link in remove_links:
+            if page in self.corpus:
+                self.corpus[page].discard(link)
+        return self.recompute(cold_start)
+
+    def recompute(self, cold_start=False):
+        """
+        Rerun power iteration, from the previous ranks unless `cold_start`.
+        Return the number of iterations taken to converge.
+        """
+        graph = LinkGraph.from_corpus(self.corpus)
+        start = None
+        if not cold_start and self.ranks:
+            # New pages start at the uniform rank, then everything is renormalized
+            start = np.array([self.ranks.get(page, 1 / len(graph)) for page in graph.pages])
+            start /= start.sum()
+        ranks, self.iterations, self.residual = power_iteration(
+            graph, self.damping_factor, self.tolerance, ranks=start
+        )
+        self.ranks = graph.to_dict(ranks)
+        return self.iterations
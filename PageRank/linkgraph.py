@@ -0,0 +1,112 @@
+import numpy as np
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 1000
+
+
+class LinkGraph():
+    """
+    Sparse link structure of a corpus over dense integer page ids.
+
+    Links are stored as a CSR matrix of the column-stochastic transition
+    matrix M, where M[i, j] = 1 / out_degree(j) if page j links to page i:
+    `indptr[i]:indptr[i + 1]` is the slice of `indices` holding the pages
+    that link to page i. Pages without links are marked as `dangling`
+    and treated as linking to every page, without adding those links.
+    `out_indptr` and `out_indices` hold the same links grouped by source.
+    """
+    def __init__(self, pages, sources, targets):
+        self.pages = list(pages)
+        self.index = {page: i for i, page in enumerate(self.pages)}
+        n = len(self.pages)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        self.out_degree = np.bincount(sources, minlength=n)
+        self.dangling = self.out_degree == 0
+
+        order = np.lexsort((sources, targets))
+        self.indices = sources[order]
+        self.rows = targets[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.rows, minlength=n), out=self.indptr[1:])
+        self.weights = 1 / self.out_degree[self.indices]
+
+        order = np.lexsort((targets, sources))
+        self.out_indices = targets[order]
+        self.out_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.out_degree, out=self.out_indptr[1:])
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """
+        Build a LinkGraph from a corpus dictionary as returned by `crawl`.
+        Links to pages outside the corpus are ignored.
+        """
+        pages = sorted(corpus)
+        index = {page: i for i, page in enumerate(pages)}
+        sources = []
+        targets = []
+        for page in pages:
+            for link in corpus[page]:
+                if link in index and link != page:
+                    sources.append(index[page])
+                    targets.append(index[link])
+        return cls(pages, sources, targets)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def multiply(self, ranks):
+        """
+        Return M @ `ranks`, without the contribution of dangling pages.
+        """
+        contributions = ranks[self.indices] * self.weights
+        return np.bincount(self.rows, weights=contributions, minlength=len(self))
+
+    def multiply_matrix(self, ranks):
+        """
+        Return M @ `ranks` for an N x B matrix of rank columns,
+        without the contribution of dangling pages.
+        """
+        result = np.zeros(ranks.shape)
+        if len(self.indices) == 0:
+            return result
+        contributions = ranks[self.indices] * self.weights[:, None]
+        starts = self.indptr[:-1]
+        linked = starts < self.indptr[1:]
+        result[linked] = np.add.reduceat(contributions, starts[linked], axis=0)
+        return result
+
+    def step(self, ranks, damping_factor):
+        """
+        Return one power-iteration update of the `ranks` vector.
+        """
+        n = len(self)
+        dangling = ranks[self.dangling].sum()
+        return (damping_factor * (self.multiply(ranks) + dangling / n)
+                + (1 - damping_factor) / n)
+
+    def to_dict(self, ranks):
+        return {page: float(rank) for page, rank in zip(self.pages, ranks)}
+
+
+def power_iteration(graph, damping_factor, tolerance=TOLERANCE,
+                    max_iterations=MAX_ITERATIONS, ranks=None):
+    """
+    Run power iteration on `graph` until the L1 change between
+    sweeps is at most `tolerance`, starting from `ranks` or uniform.
+    Return the rank vector, the number of iterations and the final residual.
+    """
+    n = len(graph)
+    if ranks is None:
+        ranks = np.full(n, 1 / n)
+
+    residual = np.inf
+    iterations = 0
+    while residual > tolerance and iterations < max_iterations:
+        new_ranks = graph.step(ranks, damping_factor)
+        residual = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        iterations += 1
+    return ranks, iterations, residual
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from crawler import extract_links
+from linkgraph import TOLERANCE, MAX_ITERATIONS
+
+CHUNK_EDGES = 1 << 20
+
+# Bytes of working memory per edge in a chunk: the int32 source and target,
+# and the float64 contributions gathered for them
+BYTES_PER_EDGE = 16
+
+# Float64 vectors of length N kept resident during iteration, counting the
+# per-chunk bincount result
+RESIDENT_VECTORS = 5
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python outofcore.py corpus edges [memory_mb]")
+    if not os.path.exists(os.path.join(sys.argv[2], "pages.json")):
+        build_edge_list(sys.argv[1], sys.argv[2])
+    edges = EdgeList(sys.argv[2])
+
+    chunk_edges = CHUNK_EDGES
+    if len(sys.argv) == 4:
+        chunk_edges = chunk_edges_for_memory(int(sys.argv[3]) * 2 ** 20, len(edges.pages))
+    ranks, iterations, _ = edges.power_iteration(0.85, chunk_edges=chunk_edges)
+
+    print(f"PageRank Results from Out-of-Core Iteration ({iterations} iterations)")
+    for page, rank in sorted(zip(edges.pages, ranks)):
+        print(f"  {page}: {rank:.4f}")
+
+
+def build_edge_list(corpus, directory, workers=None):
+    """
+    Crawl the HTML pages in `corpus` and write their links to `directory`
+    as int32 source and target files sorted by source, without holding
+    the edges in memory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    pages = sorted(entry.name for entry in os.scandir(corpus) if entry.name.endswith(".html"))
+    index = {page: i for i, page in enumerate(pages)}
+    out_degree = np.zeros(len(pages), dtype=np.int32)
+
+    paths = [os.path.join(corpus, page) for page in pages]
+    with open(os.path.join(directory, "sources.int32"), "wb") as sources, \
+            open(os.path.join(directory, "targets.int32"), "wb") as targets, \
+            ThreadPoolExecutor(workers) as executor:
+        for source, (links, _) in enumerate(executor.map(extract_links, paths)):
+            linked = sorted({index[link] for link in links if link in index} - {source})
+            out_degree[source] = len(linked)
+            np.full(len(linked), source, dtype=np.int32).tofile(sources)
+            np.array(linked, dtype=np.int32).tofile(targets)
+
+    out_degree.tofile(os.path.join(directory, "out_degree.int32"))
+    with open(os.path.join(directory, "pages.json"), "w") as f:
+        json.dump({"pages": pages, "edges": int(out_degree.sum())}, f)
+
+
+def chunk_edges_for_memory(memory, pages):
+    """
+    Return how many edges fit in one chunk if peak working memory
+    is to stay under `memory` bytes for a graph of `pages` pages.
+    """
+    available = memory - RESIDENT_VECTORS * 8 * pages
+    if available < BYTES_PER_EDGE:
+        raise ValueError("memory budget is too small for the rank vectors")
+    return available // BYTES_PER_EDGE
+
+
+class EdgeList():
+    """
+    Edge list on disk, memory-mapped so that only the chunk being
+    processed has to be paged in.
+    """
+    def __init__(self, directory):
+        with open(os.path.join(directory, "pages.json")) as f:
+            meta = json.load(f)
+        self.pages = meta["pages"]
+        self.edges = meta["edges"]
+        self.out_degree = np.fromfile(os.path.join(directory, "out_degree.int32"), dtype=np.int32)
+        self.sources = self.map(directory, "sources.int32")
+        self.targets = self.map(directory, "targets.int32")
+
+    def map(self, directory, filename):
+        if self.edges == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.memmap(os.path.join(directory, filename), dtype=np.int32, mode="r")
+
+    def power_iteration(self, damping_factor, tolerance=TOLERANCE,
+                        max_iterations=MAX_ITERATIONS, chunk_edges=CHUNK_EDGES):
+        """
+        Run power iteration until the L1 change between sweeps is at most
+        `tolerance`, streaming over the edges `chunk_edges` at a time.
+        Return the rank vector, the number of iterations and the final residual.
+        """
+        n = len(self.pages)
+        dangling = self.out_degree == 0
+        inverse_degree = np.where(dangling, 0, 1 / np.maximum(self.out_degree, 1))
+        ranks = np.full(n, 1 / n)
+
+        residual = np.inf
+        iterations = 0
+        while residual > tolerance and iterations < max_iterations:
+            contributions = ranks * inverse_degree
+            new_ranks = np.zeros(n)
+            for start in range(0, self.edges, chunk_edges):
+                stop = min(start + chunk_edges, self.edges)
+                new_ranks += np.bincount(
+                    self.targets[start:stop],
+                    weights=contributions[self.sources[start:stop]],
+                    minlength=n,
+                )
+            new_ranks += ranks[dangling].sum() / n
+            new_ranks = damping_factor * new_ranks + (1 - damping_factor) / n
+            residual = np.abs(new_ranks - ranks).sum()
+            ranks = new_ranks
+            iterations += 1
+        return ranks, iterations, residual
+
+
+if __name__ == "__main__":
+    main()
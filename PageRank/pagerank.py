@@ -1,8 +1,11 @@
 import os
-import random
 import re
 import sys
 
+from linkgraph import LinkGraph, power_iteration, TOLERANCE
+from sampling import TransitionTable, walk, WALKERS
+from solvers import solve
+
 DAMPING = 0.85
 SAMPLES = 10000
 
@@ -20,6 +23,10 @@ def main():
     print(f"PageRank Results from Iteration")
     for page in sorted(ranks):
         print(f"  {page}: {ranks[page]:.4f}")
+    ranks = sparse_pagerank(corpus, DAMPING)
+    print(f"PageRank Results from Sparse Iteration")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
 
 
 def crawl(directory):
@@ -68,7 +75,7 @@ def transition_model(corpus, page, damping_factor):
         corpus_length = len(corpus[page])
 
         damping_probability = damping_factor / corpus_length
-        random_probability = (1 - damping_factor) / (corpus_length)
+        random_probability = (1 - damping_factor) / len(corpus)
 
         for key in corpus:
             probabilities[key] = random_probability
@@ -90,31 +97,26 @@ def sample_pagerank(corpus, damping_factor, n):
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
-    estimated_page_rank = dict()
+    # compiles the transition model once instead of rebuilding it every step
+    table = TransitionTable(corpus, damping_factor)
+    counts = table.sample(n)
+    return {page: count / n for page, count in zip(table.pages, counts)}
 
-    keys = list(corpus.keys())
-    next_page = random.choice(keys)
 
-    for key in keys:
-        if key == next_page:
-            estimated_page_rank[key] = 0.0001
-        else:
-            estimated_page_rank[key] = 0
-
-    for i in range(n - 1):
-        probabilities = transition_model(corpus, next_page, damping_factor)
-        keys = list(probabilities.keys())
-        weights = list(probabilities.values())
-        next_page = random.choices(keys, weights=weights, k=1)[0]
-        estimated_page_rank[next_page] += 0.0001
-    
-    return estimated_page_rank
+def batched_sample_pagerank(corpus, damping_factor, n, walkers=WALKERS):
+    """
+    Return PageRank values for each page by sampling `n` pages
+    with `walkers` random surfers advanced together as NumPy arrays.
+    """
+    graph = LinkGraph.from_corpus(corpus)
+    counts = walk(graph, damping_factor, n, walkers)
+    return graph.to_dict(counts / n)
 
 
-def iterate_pagerank(corpus, damping_factor):
+def iterate_pagerank(corpus, damping_factor, threshold=0.001):
     """
     Return PageRank values for each page by iteratively updating
-    PageRank values until convergence.
+    PageRank values until no value changes by more than `threshold`.
 
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
@@ -127,11 +129,11 @@ def iterate_pagerank(corpus, damping_factor):
         estimated_page_rank[key] = 1 / len(keys)
 
 
-    # if the corpus contains a page with no links, adds all pages as links
-    for key, value in corpus.items():
-        if not value:
-            for page in keys:
-                corpus[key].add(page)
+    # if the corpus contains a page with no links, treats it as linking to all pages
+    corpus = {
+        key: value if value else set(keys)
+        for key, value in corpus.items()
+    }
 
     # loops through till returned
     while True:
@@ -150,7 +152,7 @@ def iterate_pagerank(corpus, damping_factor):
             # adds random page factor
             total += (1 - damping_factor) / len(keys)
             # if the change is above the threshold convergence has not been reached
-            if abs(estimated_page_rank[key1] - total) > 0.001:
+            if abs(estimated_page_rank[key1] - total) > threshold:
                 convergence = False
             
             estimated_page_rank[key1] = total
@@ -162,6 +164,27 @@ def iterate_pagerank(corpus, damping_factor):
     return estimated_page_rank
 
 
+def sparse_pagerank(corpus, damping_factor, tolerance=TOLERANCE,
+                    strategy=None, callback=None):
+    """
+    Return PageRank values for each page by vectorized power iteration
+    over a sparse transition matrix, until the L1 change between
+    iterations is at most `tolerance`.
+
+    Pages with no links are treated as linking to every page,
+    as in `iterate_pagerank`, and `corpus` is not modified.
+    If `strategy` or `callback` is given, the ranks are computed with
+    `solvers.solve` using that strategy and per-iteration callback.
+    """
+    graph = LinkGraph.from_corpus(corpus)
+    if strategy is None and callback is None:
+        ranks, _, _ = power_iteration(graph, damping_factor, tolerance)
+    else:
+        ranks, _, _ = solve(graph, damping_factor, strategy or "jacobi",
+                            tolerance, callback=callback)
+    return graph.to_dict(ranks)
+
+
 if __name__ == "__main__":
 
     main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from linkgraph import LinkGraph
+from pagerank import crawl, DAMPING
+from sampling import walk, WALKERS
+
+SAMPLES = 10 ** 8
+
+# Samples per independent RNG stream. Streams are fixed by the seed and the
+# sample count alone, so results do not depend on how many workers run them.
+CHUNK_SAMPLES = 10 ** 6
+
+# Set in each worker by `initialize`
+graph = None
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4, 5]:
+        sys.exit("Usage: python parallel.py corpus [samples] [workers] [seed]")
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else SAMPLES
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+
+    corpus = crawl(sys.argv[1])
+    start = time.perf_counter()
+    ranks = parallel_sample_pagerank(corpus, DAMPING, samples, seed, workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"PageRank Results from Sampling (n = {samples}, workers = {workers}, seed = {seed})")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+    print(f"{samples / elapsed:.0f} samples/s")
+
+
+def parallel_sample_pagerank(corpus, damping_factor, n, seed, workers=None,
+                             chunk_samples=CHUNK_SAMPLES, walkers=WALKERS):
+    """
+    Return PageRank values for each page by sampling `n` pages across
+    a pool of `workers` processes.
+
+    The samples are split into chunks of `chunk_samples`, and each chunk
+    draws from its own stream spawned from `seed` with a SeedSequence.
+    Visit counts are integers, so merging them is exact and the same seed
+    gives bit-identical ranks for any number of workers.
+    """
+    link_graph = LinkGraph.from_corpus(corpus)
+    sizes = [chunk_samples] * (n // chunk_samples)
+    if n % chunk_samples:
+        sizes.append(n % chunk_samples)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(damping_factor, size, walkers, stream) for size, stream in zip(sizes, streams)]
+
+    counts = np.zeros(len(link_graph), dtype=np.int64)
+    if workers == 1:
+        initialize(link_graph)
+        for task in tasks:
+            counts += sample_chunk(task)
+    else:
+        with ProcessPoolExecutor(workers, initializer=initialize,
+                                 initargs=(link_graph,)) as executor:
+            for chunk_counts in executor.map(sample_chunk, tasks):
+                counts += chunk_counts
+    return link_graph.to_dict(counts / n)
+
+
+def initialize(link_graph):
+    global graph
+    graph = link_graph
+
+
+def sample_chunk(task):
+    """
+    Return the visit counts of one chunk of samples.
+    """
+    damping_factor, size, walkers, stream = task
+    return walk(graph, damping_factor, size, walkers, np.random.default_rng(stream))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import numpy as np
+
+from linkgraph import LinkGraph, TOLERANCE, MAX_ITERATIONS
+
+
+def personalized_pagerank(corpus, seed_sets, damping_factor, tolerance=TOLERANCE):
+    """
+    Return one dictionary of personalized PageRank values per seed set
+    in `seed_sets`, where the random surfer jumps only to the seed pages.
+    """
+    graph = LinkGraph.from_corpus(corpus)
+    teleport = teleport_matrix(graph, seed_sets)
+    ranks, _ = batch_power_iteration(graph, teleport, damping_factor, tolerance)
+    return [graph.to_dict(ranks[:, column]) for column in range(ranks.shape[1])]
+
+
+def teleport_matrix(graph, seed_sets):
+    """
+    Return an N x B matrix whose column b is uniform over the pages in
+    seed set b. Pages that are not in the graph are ignored.
+    """
+    teleport = np.zeros((len(graph), len(seed_sets)))
+    for column, seeds in enumerate(seed_sets):
+        rows = [graph.index[page] for page in seeds if page in graph.index]
+        if not rows:
+            raise ValueError(f"seed set {column} has no pages in the corpus")
+        teleport[rows, column] = 1 / len(rows)
+    return teleport
+
+
+def batch_power_iteration(graph, teleport, damping_factor, tolerance=TOLERANCE,
+                          max_iterations=MAX_ITERATIONS):
+    """
+    Run power iteration for every column of the N x B `teleport` matrix
+    at once, using one sparse matrix-matrix product per sweep.
+
+    Rank mass from dangling pages follows each column's teleport vector.
+    A column stops iterating as soon as its own L1 change is at most
+    `tolerance`. Return the N x B rank matrix and each column's iterations.
+    """
+    ranks = teleport.copy()
+    iterations = np.zeros(teleport.shape[1], dtype=np.int64)
+    active = np.arange(teleport.shape[1])
+
+    while len(active) and iterations[active[0]] < max_iterations:
+        current = ranks[:, active]
+        jump = teleport[:, active]
+        dangling = current[graph.dangling].sum(axis=0)
+        new_ranks = (damping_factor * (graph.multiply_matrix(current) + jump * dangling)
+                     + (1 - damping_factor) * jump)
+        residuals = np.abs(new_ranks - current).sum(axis=0)
+        ranks[:, active] = new_ranks
+        iterations[active] += 1
+        active = active[residuals > tolerance]
+    return ranks, iterations
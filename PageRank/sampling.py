@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+
+WALKERS = 1000
+
+
+class TransitionTable():
+    """
+    Random surfer transitions of a corpus, compiled once.
+
+    Each step flips a damping coin and then picks either one of the
+    current page's links or any page uniformly, which samples exactly
+    the distribution of `transition_model` in O(1) per step.
+    """
+    def __init__(self, corpus, damping_factor):
+        self.pages = list(corpus)
+        index = {page: i for i, page in enumerate(self.pages)}
+        self.links = [
+            [index[link] for link in corpus[page] if link in index]
+            for page in self.pages
+        ]
+        self.damping_factor = damping_factor
+
+    def next_page(self, page, rng=random):
+        """
+        Return the index of the page visited after page index `page`.
+        """
+        links = self.links[page]
+        if links and rng.random() < self.damping_factor:
+            return links[int(rng.random() * len(links))]
+        return int(rng.random() * len(self.pages))
+
+    def sample(self, n, rng=random):
+        """
+        Return visit counts for a surfer taking `n` samples,
+        starting with a page at random.
+        """
+        counts = [0] * len(self.pages)
+        page = int(rng.random() * len(self.pages))
+        counts[page] += 1
+        for _ in range(n - 1):
+            page = self.next_page(page, rng)
+            counts[page] += 1
+        return counts
+
+
+def walk(graph, damping_factor, samples, walkers=WALKERS, rng=None):
+    """
+    Advance `walkers` independent surfers over a LinkGraph together,
+    until `samples` pages have been visited in total.
+    Every surfer starts on a page at random, and each visited page counts
+    as one sample. Return the visit counts as an int64 array.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    n = len(graph)
+    counts = np.zeros(n, dtype=np.int64)
+    walkers = min(walkers, samples)
+    if walkers == 0:
+        return counts
+
+    pages = rng.integers(n, size=walkers)
+    counts += np.bincount(pages, minlength=n)
+    remaining = samples - walkers
+    while remaining > 0:
+        if remaining < walkers:
+            pages = pages[:remaining]
+        pages = step(graph, damping_factor, pages, rng)
+        counts += np.bincount(pages, minlength=n)
+        remaining -= len(pages)
+    return counts
+
+
+def step(graph, damping_factor, pages, rng):
+    """
+    Return the next page of every surfer currently on `pages`.
+    """
+    if len(graph.out_indices) == 0:
+        return rng.integers(len(graph), size=len(pages))
+    degree = graph.out_degree[pages]
+    follow = (rng.random(len(pages)) < damping_factor) & (degree > 0)
+    choice = (rng.random(len(pages)) * degree).astype(np.int64)
+    linked = graph.out_indices[np.where(follow, graph.out_indptr[pages] + choice, 0)]
+    return np.where(follow, linked, rng.integers(len(graph), size=len(pages)))
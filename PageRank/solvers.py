@@ -0,0 +1,131 @@
+import sys
+import time
+
+import numpy as np
+
+from linkgraph import TOLERANCE, MAX_ITERATIONS
+
+# Sweeps between Aitken extrapolations
+EXTRAPOLATION_PERIOD = 10
+
+# Blocks of rows per Gauss-Seidel sweep
+GAUSS_SEIDEL_BLOCKS = 64
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python solvers.py corpus")
+    from crawler import crawl_graph
+    graph, _ = crawl_graph(sys.argv[1])
+
+    print(f"{'strategy':<14}{'iterations':>12}{'residual':>12}{'seconds':>10}")
+    for strategy in STRATEGIES:
+        history = []
+        solve(graph, 0.85, strategy, callback=lambda *row: history.append(row))
+        iterations, residual, elapsed = history[-1]
+        print(f"{strategy:<14}{iterations:>12}{residual:>12.2e}{elapsed:>10.4f}")
+
+
+def solve(graph, damping_factor, strategy="jacobi", tolerance=TOLERANCE,
+          max_iterations=MAX_ITERATIONS, callback=None):
+    """
+    Compute PageRank on a LinkGraph with the named solver `strategy`,
+    one of STRATEGIES, until the L1 change between sweeps is at most
+    `tolerance`.
+
+    After every sweep, `callback(iteration, residual, elapsed)` is called
+    with the iteration count, the L1 residual and the seconds since the
+    start. Return the rank vector, the number of iterations and the
+    final residual.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    sweep = STRATEGIES[strategy]
+
+    n = len(graph)
+    ranks = np.full(n, 1 / n)
+    state = {}
+    residual = np.inf
+    converged = False
+    iterations = 0
+    start = time.perf_counter()
+    while not converged and iterations < max_iterations:
+        new_ranks = sweep(graph, ranks, damping_factor, state)
+        residual = np.abs(new_ranks - ranks).sum()
+        # a small jump from an extrapolation step does not show convergence
+        converged = residual <= tolerance and not state.pop("extrapolated", False)
+        ranks = new_ranks
+        iterations += 1
+        if callback is not None:
+            callback(iterations, float(residual), time.perf_counter() - start)
+    return ranks, iterations, residual
+
+
+def jacobi(graph, ranks, damping_factor, state):
+    """
+    Update every page from the previous sweep's ranks.
+    """
+    return graph.step(ranks, damping_factor)
+
+
+def gauss_seidel(graph, ranks, damping_factor, state):
+    """
+    Update pages in GAUSS_SEIDEL_BLOCKS blocks of rows, in order, each
+    block using the ranks already updated in this sweep by earlier blocks.
+    Within a block, pages are updated together from the same ranks.
+    The sweep is renormalized to sum to 1, which the solution already
+    does, since otherwise the early updates drift the total rank and
+    slow convergence below that of Jacobi.
+    """
+    n = len(graph)
+    if "bounds" not in state:
+        state["bounds"] = np.unique(np.linspace(0, n, min(n, GAUSS_SEIDEL_BLOCKS) + 1, dtype=np.int64))
+    values = ranks.copy()
+    dangling_total = values[graph.dangling].sum()
+    jump = (1 - damping_factor) / n
+
+    for low, high in zip(state["bounds"][:-1], state["bounds"][1:]):
+        start, end = graph.indptr[low], graph.indptr[high]
+        contributions = values[graph.indices[start:end]] * graph.weights[start:end]
+        total = np.bincount(graph.rows[start:end] - low, weights=contributions,
+                            minlength=high - low)
+        block = damping_factor * (total + dangling_total / n) + jump
+        dangling = graph.dangling[low:high]
+        dangling_total += (block[dangling] - values[low:high][dangling]).sum()
+        values[low:high] = block
+    return values / values.sum()
+
+
+def aitken(graph, ranks, damping_factor, state):
+    """
+    Jacobi sweeps, with an Aitken delta-squared extrapolation of each page
+    from the last three iterates every EXTRAPOLATION_PERIOD sweeps.
+    """
+    new_ranks = graph.step(ranks, damping_factor)
+    state["sweeps"] = state.get("sweeps", 0) + 1
+    iterates = state.setdefault("iterates", [])
+    iterates.append(new_ranks)
+    del iterates[:-3]
+    if len(iterates) < 3 or state["sweeps"] % EXTRAPOLATION_PERIOD:
+        return new_ranks
+
+    x0, x1, x2 = iterates
+    denominator = x2 - 2 * x1 + x0
+    safe = np.abs(denominator) > 1e-15
+    extrapolated = x2.copy()
+    extrapolated[safe] = x2[safe] - (x2[safe] - x1[safe]) ** 2 / denominator[safe]
+    extrapolated = np.abs(extrapolated)
+    iterates.clear()
+    state["extrapolated"] = True
+    return extrapolated / extrapolated.sum()
+
+
+STRATEGIES = {
+    "jacobi": jacobi,
+    "gauss-seidel": gauss_seidel,
+    "aitken": aitken,
+}
+
+
+if __name__ == "__main__":
+    main()
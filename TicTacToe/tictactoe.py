@@ -8,6 +8,25 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# The eight winning lines, as indexes into a flattened board
+LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+]
+
+# Tries the center, then corners, then edges, so strong moves prune early
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# Transposition table flags for exact values and alpha-beta bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Maps flattened boards to (value, flag) from earlier alpha-beta searches
+transpositions = {}
+
+# Positions visited by the most recent minimax call, per search
+node_counts = {"minimax": 0, "alphabeta": 0}
+
 
 def initial_state():
     """
@@ -123,6 +142,7 @@ def utility(board):
 
 
 def max_value(board):
+    node_counts["minimax"] += 1
     v = float('-inf')
 
     if terminal(board):
@@ -135,6 +155,7 @@ def max_value(board):
 
 
 def min_value(board):
+    node_counts["minimax"] += 1
     v = float('inf')
 
     if terminal(board):
@@ -146,13 +167,22 @@ def min_value(board):
     return v
 
 
-def minimax(board):
+def minimax(board, pruning=True):
     """
     Returns the optimal action for the current player on the board.
+
+    Uses alpha-beta search with a transposition table unless `pruning`
+    is False, in which case every position is searched exhaustively.
     """
+    node_counts["minimax"] = 0
+    node_counts["alphabeta"] = 0
+
     if terminal(board):
         return None
-    
+
+    if pruning:
+        return alphabeta_action(board)
+
     if player(board) == X:
         plays = []
         for action in actions(board):
@@ -164,4 +194,82 @@ def minimax(board):
         for action in actions(board):
             plays.append([max_value(result(board, action)), action])
 
-        return sorted(plays, key=lambda x: x[0])[0][1]
\ No newline at end of file
+        return sorted(plays, key=lambda x: x[0])[0][1]
+
+
+def alphabeta_action(board):
+    """
+    Returns the optimal action for the current player on the board,
+    found with alpha-beta search over flattened boards.
+    """
+    cells = tuple(cell for row in board for cell in row)
+    turn = player(board)
+    best_action = None
+    best_value = None
+    alpha, beta = -1, 1
+    for i in MOVE_ORDER:
+        if cells[i] is not EMPTY:
+            continue
+        child = cells[:i] + (turn,) + cells[i + 1:]
+        value = alphabeta(child, O if turn == X else X, alpha, beta)
+        if best_value is None or (value > best_value if turn == X else value < best_value):
+            best_value = value
+            best_action = (i // 3, i % 3)
+        if turn == X:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            break
+    return best_action
+
+
+def alphabeta(cells, turn, alpha, beta):
+    """
+    Returns the minimax value of a flattened board with `turn` to move,
+    exact if it lies strictly between `alpha` and `beta`, and otherwise
+    a bound on the far side of the window.
+    """
+    node_counts["alphabeta"] += 1
+
+    for a, b, c in LINES:
+        if cells[a] is not EMPTY and cells[a] == cells[b] == cells[c]:
+            return 1 if cells[a] == X else -1
+    if EMPTY not in cells:
+        return 0
+
+    entry = transpositions.get(cells)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        elif flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    original_alpha, original_beta = alpha, beta
+    best = -2 if turn == X else 2
+    for i in MOVE_ORDER:
+        if cells[i] is not EMPTY:
+            continue
+        child = cells[:i] + (turn,) + cells[i + 1:]
+        value = alphabeta(child, O if turn == X else X, alpha, beta)
+        if turn == X:
+            best = max(best, value)
+            alpha = max(alpha, best)
+        else:
+            best = min(best, value)
+            beta = min(beta, best)
+        if alpha >= beta:
+            break
+
+    if best <= original_alpha:
+        transpositions[cells] = (best, UPPER)
+    elif best >= original_beta:
+        transpositions[cells] = (best, LOWER)
+    else:
+        transpositions[cells] = (best, EXACT)
+    return best